@@ -7,9 +7,9 @@
 """
 
 import asyncio
+from collections import Counter
 from dataclasses import dataclass, field
 import json
-import glob
 import os
 from signal import SIGCONT, SIGINT, SIGIO
 import sys
@@ -27,6 +27,13 @@ from opencis.drivers.cxl_bus_driver import CxlBusDriver
 from opencis.drivers.cxl_mem_driver import CxlMemDriver
 from opencis.drivers.pci_bus_driver import PciBusDriver
 
+from host_common import (
+    load_validation_manifest,
+    prefetch_pictures,
+    read_file,
+    write_accel_mmio_regs,
+)
+
 
 # pylint: disable=global-statement, duplicate-code
 @dataclass
@@ -51,7 +58,9 @@ class AccelInfo:
 accel_info = AccelInfo()
 host_irq_handler = None
 total_samples = 0
-validation_results = []
+validation_scores = []
+validation_reports = []
+pending_validations = {}
 sampled_file_categories = []
 cpu = None
 mem_hub = None
@@ -132,11 +141,13 @@ async def check_training_finished_type1(dev_id: int):
 
 
 async def do_img_classification_type1():
-    categories = glob.glob(config.train_data_path + "/val/*")
+    manifest = load_validation_manifest(config.train_data_path)
     global total_samples
-    total_samples = len(categories) * config.samples_from_each_category
-    global validation_results
-    validation_results = [[] for _ in range(total_samples)]
+    total_samples = len(manifest) * config.samples_from_each_category
+    global validation_scores
+    global validation_reports
+    validation_scores = [Counter() for _ in range(total_samples)]
+    validation_reports = [0] * total_samples
     global sampled_file_categories
     sampled_file_categories = []
     pic_id = 0
@@ -145,96 +156,89 @@ async def do_img_classification_type1():
         f"Validation process started. Total pictures: {total_samples}, "
         f"Num. of Accelerators: {config.accel_count}"
     )
-    with tqdm(total=total_samples, desc="Picture", position=0) as pbar_cat:
-        for c in categories:
-            logger.debug(cpu.create_message(f"Validating category: {c}"))
-            category_pics = glob.glob(f"{c}/*.JPEG")
-            sample_pics = sample(category_pics, config.samples_from_each_category)
-            category_name = c.split(os.path.sep)[-1]
-            sampled_file_categories += [category_name] * config.samples_from_each_category
-            for s in sample_pics:
-                with open(s, "rb") as f:
-                    pic_data = f.read()
-                pic_data_int = int.from_bytes(pic_data, "little")
-                pic_data_len = len(pic_data)
-                pic_data_len_rounded = (((pic_data_len - 1) // 64) + 1) * 64
-                logger.debug(
-                    f"Reading loc: 0x{pic_data_mem_loc:x}" f"len: 0x{pic_data_len_rounded:x}"
-                )
-                await cpu.store(
-                    pic_data_mem_loc,
-                    pic_data_len_rounded,
-                    pic_data_int,
+    sample_pics = []
+    for category_name, category_pics in manifest.items():
+        logger.debug(cpu.create_message(f"Sampling category: {category_name}"))
+        sample_pics += sample(category_pics, config.samples_from_each_category)
+        sampled_file_categories += [category_name] * config.samples_from_each_category
+
+    for dev_id in range(config.accel_count):
+        host_irq_handler.register_interrupt_handler(
+            Irq.ACCEL_VALIDATION_FINISHED, save_validation_result_type1, dev_id
+        )
+        pending_validations[dev_id] = (None, asyncio.Event())
+
+    pic_queue = asyncio.Queue(maxsize=2)
+    prefetch_task = asyncio.create_task(prefetch_pictures(sample_pics, pic_queue))
+    # Progress bars are only drawn on a terminal, and the device bar is reset per picture
+    pbar_cat = tqdm(total=total_samples, desc="Picture", position=0, disable=None)
+    pbar_dev = tqdm(
+        total=config.accel_count, desc="Device Progress", position=1, leave=False, disable=None
+    )
+    with pbar_cat, pbar_dev:
+        for _ in range(len(sample_pics)):
+            pic_data = await pic_queue.get()
+            if isinstance(pic_data, Exception):
+                raise pic_data
+            pic_data_len = len(pic_data)
+            logger.debug(f"Reading loc: 0x{pic_data_mem_loc:x}" f"len: 0x{pic_data_len:x}")
+            await cpu.store_bytes(pic_data_mem_loc, pic_data)
+            pbar_dev.reset()
+            # Each device has its own IRQ line and MMIO window, so all of them
+            # validate the picture concurrently
+            await asyncio.gather(
+                *(
+                    validate_picture_type1(dev_id, pic_id, pic_data_mem_loc, pic_data_len, pbar_dev)
+                    for dev_id in range(config.accel_count)
                 )
-                pic_events: list[asyncio.Event] = []
-                for dev_id in tqdm(
-                    range(config.accel_count),
-                    desc="Device Progress",
-                    position=1,
-                    leave=False,
-                ):
-                    event = asyncio.Event()
-                    pic_events.append(event)
-                    host_irq_handler.register_interrupt_handler(
-                        Irq.ACCEL_VALIDATION_FINISHED,
-                        save_validation_result_type1(pic_id, event),
-                        dev_id,
-                    )
-
-                    await cpu.store(to_accel_mmio_addr(dev_id, 0x1810), 8, pic_data_mem_loc)
-                    await cpu.store(to_accel_mmio_addr(dev_id, 0x1818), 8, pic_data_len)
-                    while True:
-                        pic_data_mem_loc_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1810), 8)
-                        pic_data_len_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1818), 8)
-
-                        if (
-                            pic_data_mem_loc_rb == pic_data_mem_loc
-                            and pic_data_len_rb == pic_data_len
-                        ):
-                            break
-                        await asyncio.sleep(0.1)
-
-                    await host_irq_handler.send_irq_request(Irq.HOST_SENT, dev_id)
-                    await event.wait()
-                pic_data_mem_loc += pic_data_len
-                pic_data_mem_loc = (((pic_data_mem_loc - 1) // 64) + 1) * 64
-                pic_id += 1
-                pbar_cat.update(1)
+            )
+            pic_data_mem_loc += pic_data_len
+            pic_data_mem_loc = (pic_data_mem_loc + 63) & ~63
+            pic_id += 1
+            pbar_cat.update(1)
+    await prefetch_task
 
     merge_validation_results()
     stop_signal.set()
 
 
-def save_validation_result_type1(pic_id: int, event: asyncio.Event):
-    async def _func(dev_id: int):
-        logger.debug(f"Saving validation results pic: {pic_id}, dev: {dev_id}")
-        host_result_addr = await cpu.load(to_accel_mmio_addr(dev_id, 0x1820), 8)
-        host_result_len = await cpu.load(to_accel_mmio_addr(dev_id, 0x1828), 8)
-        data_bytes = await cpu.load_bytes(host_result_addr, host_result_len)
-        validate_result = json.loads(data_bytes.decode())
-        validation_results[pic_id].append(validate_result)
-        event.set()
+async def validate_picture_type1(
+    dev_id: int, pic_id: int, pic_data_mem_loc: int, pic_data_len: int, pbar_dev: tqdm
+):
+    event = pending_validations[dev_id][1]
+    event.clear()
+    pending_validations[dev_id] = (pic_id, event)
+
+    await write_accel_mmio_regs(
+        mem_hub, to_accel_mmio_addr(dev_id, 0x1810), [pic_data_mem_loc, pic_data_len]
+    )
+
+    await host_irq_handler.send_irq_request(Irq.HOST_SENT, dev_id)
+    await event.wait()
+    pbar_dev.update(1)
 
-    return _func
+
+async def save_validation_result_type1(dev_id: int):
+    pic_id, event = pending_validations[dev_id]
+    logger.debug(f"Saving validation results pic: {pic_id}, dev: {dev_id}")
+    host_result_addr, host_result_len = await mem_hub.read_mmio_batch(
+        [(to_accel_mmio_addr(dev_id, 0x1820), 8), (to_accel_mmio_addr(dev_id, 0x1828), 8)]
+    )
+    data_bytes = await cpu.load_bytes(host_result_addr, host_result_len)
+    validate_result = json.loads(data_bytes)
+    # Scores of all devices are summed up as soon as they arrive
+    validation_scores[pic_id].update(validate_result)
+    validation_reports[pic_id] += 1
+    event.set()
 
 
 def merge_validation_results():
     correct_count = 0
     for pic_id in range(total_samples):
-        merged_result = {}
-        max_v = 0
-        max_k = 0
-        assert len(validation_results[pic_id]) == config.accel_count
+        assert validation_reports[pic_id] == config.accel_count
         real_category = sampled_file_categories[pic_id]
-        for dev_result in validation_results[pic_id]:
-            for k, v in dev_result.items():
-                if k not in merged_result:
-                    merged_result[k] = v
-                else:
-                    merged_result[k] += v
-                if merged_result[k] > max_v:
-                    max_v = merged_result[k]
-                    max_k = k
+        merged_result = validation_scores[pic_id]
+        max_k = max(merged_result, key=merged_result.get)
         if max_k == real_category:
             correct_count += 1
 
@@ -259,31 +263,27 @@ async def my_img_classification_app(_cpu: CPU, _mem_hub: CxlMemoryHub):
     await start_signal.wait()
     logger.info("Host main process running!")
 
-    with open(f"{config.train_data_path}/noisy_imagenette.csv", "rb") as f:
-        csv_data = f.read()
+    csv_data = await asyncio.to_thread(read_file, f"{config.train_data_path}/noisy_imagenette.csv")
 
-    csv_data_int = int.from_bytes(csv_data, "little")
     csv_data_len = len(csv_data)
-    csv_data_len_rounded = (((csv_data_len - 1) // 64) + 1) * 64
 
     logger.info("Storing metadata...")
     CSV_DATA_MEM_OFFSET = 0x4000
-    await cpu.store(
-        to_sys_mem_addr(CSV_DATA_MEM_OFFSET),
-        csv_data_len_rounded,
-        csv_data_int,
-        prog_bar=True,
-    )
+    # Devices validate concurrently, so each one writes its results to its own buffer
+    RESULTS_MEM_OFFSET = 0x900
+    RESULTS_BUFFER_SIZE = 0x400
+    if RESULTS_MEM_OFFSET + config.accel_count * RESULTS_BUFFER_SIZE > CSV_DATA_MEM_OFFSET:
+        raise Exception(f"Result buffers of {config.accel_count} devices overlap the metadata")
+    await cpu.store_bytes(to_sys_mem_addr(CSV_DATA_MEM_OFFSET), csv_data, prog_bar=True)
     for dev_id in range(config.accel_count):
-        await cpu.store(to_accel_mmio_addr(dev_id, 0x1800), 8, CSV_DATA_MEM_OFFSET)
-        await cpu.store(to_accel_mmio_addr(dev_id, 0x1808), 8, csv_data_len)
-        while True:
-            csv_data_mem_loc_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1800), 8)
-            csv_data_len_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1808), 8)
-
-            if csv_data_mem_loc_rb == CSV_DATA_MEM_OFFSET and csv_data_len_rb == csv_data_len:
-                break
-            await asyncio.sleep(0.1)
+        await write_accel_mmio_regs(
+            mem_hub, to_accel_mmio_addr(dev_id, 0x1800), [CSV_DATA_MEM_OFFSET, csv_data_len]
+        )
+        await write_accel_mmio_regs(
+            mem_hub,
+            to_accel_mmio_addr(dev_id, 0x1830),
+            [RESULTS_MEM_OFFSET + dev_id * RESULTS_BUFFER_SIZE, RESULTS_BUFFER_SIZE],
+        )
 
         host_irq_handler.register_interrupt_handler(
             Irq.ACCEL_TRAINING_FINISHED, check_training_finished_type1, dev_id
@@ -320,6 +320,8 @@ async def main():
     sw_portno = int(sys.argv[1])
     accel_count = int(sys.argv[2])
     train_data_path = sys.argv[3] if len(sys.argv) > 3 else None
+    if train_data_path is None or not os.path.isdir(os.path.join(train_data_path, "val")):
+        raise Exception(f"No val directory found in training data path {train_data_path}")
 
     global config
     config = ImageClassificationConfigs(
@@ -7,9 +7,9 @@
 """
 
 import asyncio
+from collections import Counter
 from dataclasses import dataclass, field
 import json
-import glob
 import os
 import sys
 from random import sample
@@ -26,6 +26,13 @@ from opencis.drivers.cxl_bus_driver import CxlBusDriver
 from opencis.drivers.cxl_mem_driver import CxlMemDriver
 from opencis.drivers.pci_bus_driver import PciBusDriver
 
+from host_common import (
+    load_validation_manifest,
+    prefetch_pictures,
+    read_file,
+    write_accel_mmio_regs,
+)
+
 
 # pylint: disable=global-statement, duplicate-code
 
@@ -52,7 +59,9 @@ class AccelInfo:
 accel_info = AccelInfo()
 host_irq_handler = None
 total_samples = 0
-validation_results = []
+validation_scores = []
+validation_reports = []
+pending_validations = {}
 sampled_file_categories = []
 cpu = None
 mem_hub = None
@@ -135,95 +144,91 @@ async def check_training_finished_type2(dev_id: int):
 
 
 async def do_img_classification_type2():
-    categories = glob.glob(config.train_data_path + "/val/*")
+    manifest = load_validation_manifest(config.train_data_path)
     global total_samples
-    total_samples = len(categories) * config.sample_from_each_category
+    total_samples = len(manifest) * config.sample_from_each_category
 
-    global validation_results
-    validation_results = [[] for i in range(total_samples)]
+    global validation_scores
+    global validation_reports
+    validation_scores = [Counter() for _ in range(total_samples)]
+    validation_reports = [0] * total_samples
 
     pic_id = 0
     IMAGE_WRITE_ADDR = 0x8000
     global sampled_file_categories
     sampled_file_categories = []
-    for c in categories:
-        category_pics = glob.glob(f"{c}/*.JPEG")
-        sample_pics = sample(category_pics, config.sample_from_each_category)
-        category_name = c.split(os.path.sep)[-1]
+    sample_pics = []
+    for category_name, category_pics in manifest.items():
+        sample_pics += sample(category_pics, config.sample_from_each_category)
         sampled_file_categories += [category_name] * config.sample_from_each_category
-        for s in sample_pics:
-            with open(s, "rb") as f:
-                pic_data = f.read()
-            pic_data_int = int.from_bytes(pic_data, "little")
-            pic_data_len = len(pic_data)
-            pic_data_len_rounded = (((pic_data_len - 1) // 64) + 1) * 64
-            for dev_id in range(config.accel_count):
-                event = asyncio.Event()
-                write_addr = to_accel_mem_addr(dev_id, IMAGE_WRITE_ADDR)
-                logger.debug(f"dev_id:{dev_id} img_addr:{write_addr:x} len:{pic_data_len:x}")
-                await cpu.store(
-                    write_addr,
-                    pic_data_len_rounded,
-                    pic_data_int,
-                    prog_bar=True,
-                )
-                await cpu.store(to_accel_mmio_addr(dev_id, 0x1810), 8, IMAGE_WRITE_ADDR)
-                await cpu.store(to_accel_mmio_addr(dev_id, 0x1818), 8, pic_data_len)
-                while True:
-                    pic_data_mem_loc_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1810), 8)
-                    pic_data_len_rb = await cpu.load(to_accel_mmio_addr(dev_id, 0x1818), 8)
-                    if pic_data_mem_loc_rb == IMAGE_WRITE_ADDR and pic_data_len_rb == pic_data_len:
-                        break
-                    await asyncio.sleep(0.1)
-
-                host_irq_handler.register_interrupt_handler(
-                    Irq.ACCEL_VALIDATION_FINISHED,
-                    save_results_type2(pic_id, event),
-                    dev_id,
-                )
-                await host_irq_handler.send_irq_request(Irq.HOST_SENT, dev_id)
-                await event.wait()
-
-                # Currently we don't send the picture information to the device
-                # and to prevent race condition, we need to send pics synchronously
-            pic_id += 1
+
+    for dev_id in range(config.accel_count):
+        host_irq_handler.register_interrupt_handler(
+            Irq.ACCEL_VALIDATION_FINISHED, save_results_type2, dev_id
+        )
+        pending_validations[dev_id] = (None, asyncio.Event())
+
+    pic_queue = asyncio.Queue(maxsize=2)
+    prefetch_task = asyncio.create_task(prefetch_pictures(sample_pics, pic_queue))
+    for _ in range(len(sample_pics)):
+        pic_data = await pic_queue.get()
+        if isinstance(pic_data, Exception):
+            raise pic_data
+        # Each device gets its own copy of the picture in its memory, so all of
+        # them validate the picture concurrently
+        await asyncio.gather(
+            *(
+                validate_picture_type2(dev_id, pic_id, IMAGE_WRITE_ADDR, pic_data)
+                for dev_id in range(config.accel_count)
+            )
+        )
+        pic_id += 1
+    await prefetch_task
 
     merge_validation_results()
     stop_signal.set()
 
 
-def save_results_type2(pic_id: int, event: asyncio.Event):
-    async def _func(dev_id: int):
-        logger.info(f"Saving validation results for pic: {pic_id} from dev: {dev_id}")
-        host_result_addr = await cpu.load(to_accel_mmio_addr(dev_id, 0x1820), 8)
-        host_result_len = await cpu.load(to_accel_mmio_addr(dev_id, 0x1828), 8)
+async def validate_picture_type2(dev_id: int, pic_id: int, pic_data_mem_loc: int, pic_data: bytes):
+    event = pending_validations[dev_id][1]
+    event.clear()
+    pending_validations[dev_id] = (pic_id, event)
+
+    pic_data_len = len(pic_data)
+    write_addr = to_accel_mem_addr(dev_id, pic_data_mem_loc)
+    logger.debug(f"dev_id:{dev_id} img_addr:{write_addr:x} len:{pic_data_len:x}")
+    await cpu.store_bytes(write_addr, pic_data)
+    await write_accel_mmio_regs(
+        mem_hub, to_accel_mmio_addr(dev_id, 0x1810), [pic_data_mem_loc, pic_data_len]
+    )
+
+    await host_irq_handler.send_irq_request(Irq.HOST_SENT, dev_id)
+    await event.wait()
 
-        host_result_addr = to_accel_mem_addr(dev_id, host_result_addr)
-        data_bytes = await cpu.load_bytes(host_result_addr, host_result_len)
-        validate_result = json.loads(data_bytes.decode())
-        validation_results[pic_id].append(validate_result)
-        event.set()
 
-    return _func
+async def save_results_type2(dev_id: int):
+    pic_id, event = pending_validations[dev_id]
+    logger.info(f"Saving validation results for pic: {pic_id} from dev: {dev_id}")
+    host_result_addr, host_result_len = await mem_hub.read_mmio_batch(
+        [(to_accel_mmio_addr(dev_id, 0x1820), 8), (to_accel_mmio_addr(dev_id, 0x1828), 8)]
+    )
+
+    host_result_addr = to_accel_mem_addr(dev_id, host_result_addr)
+    data_bytes = await cpu.load_bytes(host_result_addr, host_result_len)
+    validate_result = json.loads(data_bytes)
+    # Scores of all devices are summed up as soon as they arrive
+    validation_scores[pic_id].update(validate_result)
+    validation_reports[pic_id] += 1
+    event.set()
 
 
 def merge_validation_results():
     correct_count = 0
     for pic_id in range(total_samples):
-        merged_result = {}
-        max_v = 0
-        max_k = 0
-        assert len(validation_results[pic_id]) == config.accel_count
+        assert validation_reports[pic_id] == config.accel_count
         real_category = sampled_file_categories[pic_id]
-        for dev_result in validation_results[pic_id]:
-            for k, v in dev_result.items():
-                if k not in merged_result:
-                    merged_result[k] = v
-                else:
-                    merged_result[k] += v
-                if merged_result[k] > max_v:
-                    max_v = merged_result[k]
-                    max_k = k
+        merged_result = validation_scores[pic_id]
+        max_k = max(merged_result, key=merged_result.get)
         if max_k == real_category:
             correct_count += 1
 
@@ -250,30 +255,25 @@ async def my_img_classification_app(_cpu: CPU, _mem_hub: CxlMemoryHub):
     await start_signal.wait()
     logger.info(cpu.create_message("Host main process running!"))
 
-    with open(f"{config.train_data_path}/noisy_imagenette.csv", "rb") as f:
-        csv_data = f.read()
-    csv_data_int = int.from_bytes(csv_data, "little")
+    csv_data = await asyncio.to_thread(read_file, f"{config.train_data_path}/noisy_imagenette.csv")
     csv_data_len = len(csv_data)
-    csv_data_len_rounded = (((csv_data_len - 1) // 64) + 1) * 64
 
-    for dev_id in range(config.accel_count):
+    async def send_metadata(dev_id: int):
         logger.info(cpu.create_message(f"Sending Metadata to dev {dev_id}"))
         write_addr = to_accel_mem_addr(dev_id, CSV_DATA_MEM_OFFSET)
-        await cpu.store(write_addr, csv_data_len_rounded, csv_data_int, prog_bar=True)
+        await cpu.store_bytes(write_addr, csv_data)
 
-        await mem_hub.write_mmio(to_accel_mmio_addr(dev_id, 0x1800), 8, CSV_DATA_MEM_OFFSET)
-        await mem_hub.write_mmio(to_accel_mmio_addr(dev_id, 0x1808), 8, csv_data_len)
-        while True:
-            csv_data_mem_loc_rb = await mem_hub.read_mmio(to_accel_mmio_addr(dev_id, 0x1800), 8)
-            csv_data_len_rb = await mem_hub.read_mmio(to_accel_mmio_addr(dev_id, 0x1808), 8)
-            if csv_data_mem_loc_rb == CSV_DATA_MEM_OFFSET and csv_data_len_rb == csv_data_len:
-                break
-            await asyncio.sleep(0.1)
+        await write_accel_mmio_regs(
+            mem_hub, to_accel_mmio_addr(dev_id, 0x1800), [CSV_DATA_MEM_OFFSET, csv_data_len]
+        )
 
         host_irq_handler.register_interrupt_handler(
             Irq.ACCEL_TRAINING_FINISHED, check_training_finished_type2, dev_id
         )
 
+    # Device memory ranges are disjoint, so the metadata is sent to all of them at once
+    await asyncio.gather(*(send_metadata(dev_id) for dev_id in range(config.accel_count)))
+
     # kick off accel training
     logger.info("[APP] Notifying Host Ready to Accelerators")
     for dev_id in range(config.accel_count):
@@ -307,6 +307,10 @@ async def main():
     sw_portno = int(sys.argv[1])
     accel_count = int(sys.argv[2])
     train_data_path = sys.argv[3] if len(sys.argv) > 3 else None
+    if train_data_path is None or not os.path.isfile(
+        os.path.join(train_data_path, "noisy_imagenette.csv")
+    ):
+        raise Exception(f"No noisy_imagenette.csv found in training data path {train_data_path}")
 
     global config
     config = ImageClassificationConfigs(
@@ -0,0 +1,94 @@
+"""
+ Copyright (c) 2024, Eeum, Inc.
+
+ This software is licensed under the terms of the Revised BSD License.
+ See LICENSE for details.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from opencis.cxl.component.cxl_memory_hub import CxlMemoryHub
+from opencis.util.logger import logger
+
+
+def get_manifest_cache_path(val_path: str) -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha256(val_path.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, "opencis", f"manifest-{key}.json")
+
+
+def scan_validation_pictures(category_dirs: List[os.DirEntry]) -> Dict[str, List[str]]:
+    categories = {}
+    for category in category_dirs:
+        with os.scandir(category.path) as pic_entries:
+            categories[category.name] = sorted(
+                pic.path for pic in pic_entries if pic.name.endswith(".JPEG")
+            )
+    return categories
+
+
+def load_validation_manifest(train_data_path: str) -> Dict[str, List[str]]:
+    # NOTE: The picture list is cached outside the dataset, keyed on the modification
+    # time of every category directory. Adding, removing or renaming a picture updates
+    # the mtime of its directory, so any such change makes the cache rebuild
+    val_path = os.path.abspath(os.path.join(train_data_path, "val"))
+    with os.scandir(val_path) as category_entries:
+        category_dirs = sorted(
+            (category for category in category_entries if category.is_dir()),
+            key=lambda category: category.name,
+        )
+    # NOTE: mtimes are taken before the scan, so a change during the scan only
+    # makes the next run rebuild the cache again
+    mtimes = {category.name: category.stat().st_mtime_ns for category in category_dirs}
+
+    cache_path = get_manifest_cache_path(val_path)
+    try:
+        with open(cache_path) as f:
+            manifest = json.load(f)
+        if manifest["val_path"] == val_path and manifest["mtimes"] == mtimes:
+            return manifest["categories"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    categories = scan_validation_pictures(category_dirs)
+    manifest = {"val_path": val_path, "mtimes": mtimes, "categories": categories}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache the validation manifest at {cache_path}: {e}")
+    return categories
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def prefetch_pictures(paths: List[str], queue: asyncio.Queue):
+    # Reads the next pictures off the event loop while the current one is validated.
+    # A failed read is queued in place of the picture so the consumer raises it
+    for path in paths:
+        try:
+            pic_data = await asyncio.to_thread(read_file, path)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(pic_data)
+
+
+async def write_accel_mmio_regs(mem_hub: CxlMemoryHub, addr: int, values: List[int]):
+    # Consecutive 8-byte registers are written in one batch and polled until they read back
+    regs = [(addr + i * 8, 8) for i in range(len(values))]
+    await mem_hub.write_mmio_batch([(reg, size, v) for (reg, size), v in zip(regs, values)])
+    backoff = 0.001
+    while await mem_hub.read_mmio_batch(regs) != values:
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 0.05)
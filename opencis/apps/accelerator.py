@@ -6,10 +6,8 @@
 """
 
 # pylint: disable=unused-import
-from asyncio import CancelledError, gather, create_task, Event, sleep
-import glob
+from asyncio import CancelledError, gather, create_task, Event
 from io import BytesIO
-import math
 import traceback
 from typing import cast
 import shutil
@@ -233,7 +231,7 @@ class MyType1Accelerator(RunnableComponent):
         metadata_addr = await self._cxl_type1_device.read_mmio(metadata_addr_mmio_addr, 8)
         metadata_size = await self._cxl_type1_device.read_mmio(metadata_size_mmio_addr, 8)
 
-        metadata_rounded_size = ((metadata_size - 1) // 64 + 1) * 64
+        metadata_rounded_size = (metadata_size + 63) & ~63
         metadata_end = metadata_addr + metadata_size
 
         logger.debug(self._create_message("Writing metadata"))
@@ -294,37 +292,34 @@ class MyType1Accelerator(RunnableComponent):
         pred_logit = self._model(tens)
         predicted_probs = torch.softmax(pred_logit, dim=1)[0]
 
-        categories = glob.glob(f"{self._val_folder}{os.path.sep}*")
-        pred_kv = {
-            self._test_dataset.classes[i]: predicted_probs[i].item() for i in range(len(categories))
-        }
+        pred_kv = dict(zip(self._test_dataset.classes, predicted_probs.tolist()))
 
         json_asenc = str.encode(json.dumps(pred_kv))
         bytes_size = len(json_asenc)
 
-        json_asint = int.from_bytes(json_asenc, "little")
-
-        RESULTS_HPA = 0x900  # Arbitrarily chosen
-
-        rounded_bytes_size = (((bytes_size - 1) // 64) + 1) * 64
-        await self._cxl_type1_device.cxl_cache_write(
-            RESULTS_HPA, max(64, rounded_bytes_size), json_asint
+        # The host hands each device its own result buffer, so concurrent
+        # validations never overwrite each other's results
+        results_buffer_addr_mmio_addr = 0x1830
+        results_buffer_size_mmio_addr = 0x1838
+        results_hpa = await self._cxl_type1_device.read_mmio(results_buffer_addr_mmio_addr, 8)
+        results_buffer_size = await self._cxl_type1_device.read_mmio(
+            results_buffer_size_mmio_addr, 8
         )
 
+        rounded_bytes_size = max(64, (bytes_size + 63) & ~63)
+        if rounded_bytes_size > results_buffer_size:
+            raise Exception(
+                f"Validation result ({bytes_size} bytes) does not fit in the "
+                f"{results_buffer_size}-byte result buffer"
+            )
+        await self._cxl_type1_device.cxl_cache_write(results_hpa, rounded_bytes_size, json_asenc)
+
         HOST_VECTOR_ADDR = 0x1820
         HOST_VECTOR_SIZE = 0x1828
 
-        await self._cxl_type1_device.write_mmio(HOST_VECTOR_ADDR, 8, RESULTS_HPA)
+        await self._cxl_type1_device.write_mmio(HOST_VECTOR_ADDR, 8, results_hpa)
         await self._cxl_type1_device.write_mmio(HOST_VECTOR_SIZE, 8, bytes_size)
 
-        while True:
-            json_addr_rb = await self._cxl_type1_device.read_mmio(HOST_VECTOR_ADDR, 8)
-            json_size_rb = await self._cxl_type1_device.read_mmio(HOST_VECTOR_SIZE, 8)
-
-            if json_addr_rb == RESULTS_HPA and json_size_rb == bytes_size:
-                break
-            await sleep(0.2)
-
         # Done with eval
         await self._irq_manager.send_irq_request(Irq.ACCEL_VALIDATION_FINISHED)
 
@@ -601,7 +596,7 @@ class MyType2Accelerator(RunnableComponent):
         metadata_size = await self._cxl_type2_device.read_mmio(metadata_size_mmio_addr, 8)
 
         # round to 64
-        metadata_size = ((metadata_size - 1) // 64 + 1) * 64
+        metadata_size = (metadata_size + 63) & ~63
 
         metadata_end = metadata_addr + metadata_size
 
@@ -656,23 +651,15 @@ class MyType2Accelerator(RunnableComponent):
         pred_logit = self._model(tens)
         predicted_probs = torch.softmax(pred_logit, dim=1)[0]
 
-        categories = glob.glob(f"{self._val_folder}{os.path.sep}*")
-        pred_kv = {
-            self._test_dataset.classes[i]: predicted_probs[i].item() for i in range(len(categories))
-        }
+        pred_kv = dict(zip(self._test_dataset.classes, predicted_probs.tolist()))
 
         json_asenc = str.encode(json.dumps(pred_kv))
         bytes_size = len(json_asenc)
 
-        json_asint = int.from_bytes(json_asenc, "little")
         RESULTS_OFFSET = 0x900  # Arbitrarily chosen
-        rounded_bytes_size = math.ceil(bytes_size / 64) * 64
-        curr_written = 0
-        while curr_written < rounded_bytes_size:
-            chunk = json_asint & ((1 << (64 * 8)) - 1)
-            await self._cxl_type2_device.write_mem_dpa(RESULTS_OFFSET + curr_written, chunk, 64)
-            json_asint >>= 64 * 8
-            curr_written += 64
+        for offset in range(0, bytes_size, 64):
+            chunk = int.from_bytes(json_asenc[offset : offset + 64], "little")
+            await self._cxl_type2_device.write_mem_dpa(RESULTS_OFFSET + offset, chunk, 64)
 
         HOST_VECTOR_ADDR = 0x1820
         HOST_VECTOR_SIZE = 0x1828
@@ -680,13 +667,6 @@ class MyType2Accelerator(RunnableComponent):
         await self._cxl_type2_device.write_mmio(HOST_VECTOR_ADDR, 8, RESULTS_OFFSET)
         await self._cxl_type2_device.write_mmio(HOST_VECTOR_SIZE, 8, bytes_size)
 
-        while True:
-            json_addr_rb = await self._cxl_type2_device.read_mmio(HOST_VECTOR_ADDR, 8)
-            json_size_rb = await self._cxl_type2_device.read_mmio(HOST_VECTOR_SIZE, 8)
-
-            if json_addr_rb == RESULTS_OFFSET and json_size_rb == bytes_size:
-                break
-            await sleep(0.1)
         logger.debug(f"Sending irq ACCEL_VALIDATION_FINISHED from dev {self._device_id}")
         # Done with eval
         await self._irq_manager.send_irq_request(Irq.ACCEL_VALIDATION_FINISHED)
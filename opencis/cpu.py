@@ -6,12 +6,14 @@
 """
 
 import asyncio
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Union
 from tqdm.auto import tqdm
 
 from opencis.util.component import RunnableComponent
 from opencis.cxl.component.cxl_memory_hub import CxlMemoryHub
 
+BULK_CHUNK_SIZE = 4096
+
 
 class CPU(RunnableComponent):
     def __init__(
@@ -37,9 +39,8 @@ class CPU(RunnableComponent):
         return data
 
     async def load_bytes(self, addr: int, size: int, prog_bar: bool = False) -> bytes:
-        end = addr + size
-        result = b""
-        with tqdm(
+        result = bytearray(size)
+        with memoryview(result) as view, tqdm(
             total=size,
             desc="Reading Data",
             unit="iB",
@@ -47,39 +48,42 @@ class CPU(RunnableComponent):
             unit_divisor=1024,
             disable=not prog_bar,
         ) as pbar:
-            for cacheline_offset in range(addr, addr + size, 64):
-                cacheline = await self._cxl_mem_hub.load(cacheline_offset, 64)
-                chunk_size = min(64, (end - cacheline_offset))
-                chunk_data = cacheline.to_bytes(64, "little")
-                result += chunk_data[:chunk_size]
+            for offset in range(0, size, BULK_CHUNK_SIZE):
+                chunk_size = min(BULK_CHUNK_SIZE, size - offset)
+                chunk = await self._cxl_mem_hub.load_bytes(addr + offset, chunk_size)
+                view[offset : offset + chunk_size] = chunk
                 pbar.update(chunk_size)
-        return result
+        return bytes(result)
 
     async def store(self, addr: int, size: int, value: int, prog_bar: bool = False):
         if size <= 64:
-            res = await self._cxl_mem_hub.store(addr, size, value)
-        else:
-            if addr % 64 or size % 64:
-                raise Exception("Size and address must be aligned to 64!")
+            return await self._cxl_mem_hub.store(addr, size, value)
+        if addr % 64 or size % 64:
+            raise Exception("Size and address must be aligned to 64!")
+        # NOTE: Converting once avoids shifting the whole value for every cacheline
+        data = (value & ((1 << (size * 8)) - 1)).to_bytes(size, "little")
+        return await self.store_bytes(addr, data, prog_bar)
+
+    async def store_bytes(self, addr: int, data: Union[bytes, memoryview], prog_bar: bool = False):
+        if addr % 64:
+            raise Exception("Address must be aligned to 64!")
 
-            with tqdm(
-                total=size,
-                desc="Writing Data",
-                unit="iB",
-                unit_scale=True,
-                unit_divisor=1024,
-                disable=not prog_bar,
-            ) as pbar:
-                chunk_count = 0
-                while size > 0:
-                    low_64_byte = value & ((1 << (64 * 8)) - 1)
-                    res = await self._cxl_mem_hub.store(addr + (chunk_count * 64), 64, low_64_byte)
-                    if not res:
-                        return res
-                    size -= 64
-                    chunk_count += 1
-                    value >>= 64 * 8
-                    pbar.update(64)
+        res = None
+        size = len(data)
+        with memoryview(data) as view, tqdm(
+            total=size,
+            desc="Writing Data",
+            unit="iB",
+            unit_scale=True,
+            unit_divisor=1024,
+            disable=not prog_bar,
+        ) as pbar:
+            for offset in range(0, size, BULK_CHUNK_SIZE):
+                chunk = view[offset : offset + BULK_CHUNK_SIZE]
+                res = await self._cxl_mem_hub.store_bytes(addr + offset, chunk)
+                if not res:
+                    return res
+                pbar.update(len(chunk))
         return res
 
     async def _app_run_task(self):
@@ -5,6 +5,7 @@
  See LICENSE for details.
 """
 
+import struct
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
 
@@ -112,29 +113,26 @@ class CCI_VENDOR_SPECIFIC_OPCODE(IntEnum):
     TUNNEL_MANAGEMENT_COMMAND = 0xC010
 
 
+_OPCODE_NAMES = {
+    int(member): member.name
+    for opcode_enum in (
+        CCI_GENERIC_COMMAND_OPCODE,
+        CCI_FM_API_COMMAND_OPCODE,
+        CCI_VENDOR_SPECIFIC_OPCODE,
+    )
+    for member in opcode_enum
+}
+
+
 def get_opcode_string(opcode: int) -> str:
-    if (
-        CCI_GENERIC_COMMAND_OPCODE.IDENTIFY
-        <= opcode
-        <= CCI_GENERIC_COMMAND_OPCODE.PERFORM_MAINTENANCE
-    ):
-        return CCI_GENERIC_COMMAND_OPCODE(opcode).name
-
-    if (
-        CCI_FM_API_COMMAND_OPCODE.IDENTIFY_SWITCH_DEVICE
-        <= opcode
-        <= CCI_FM_API_COMMAND_OPCODE.INITIATE_DYNAMIC_CAPACITY_RELEASE
-    ):
-        return CCI_FM_API_COMMAND_OPCODE(opcode).name
-
-    if (
-        CCI_VENDOR_SPECIFIC_OPCODE.NOTIFY_PORT_UPDATE
-        <= opcode
-        <= CCI_VENDOR_SPECIFIC_OPCODE.TUNNEL_MANAGEMENT_COMMAND
-    ):
-        return CCI_VENDOR_SPECIFIC_OPCODE(opcode).name
-
-    return "Unknown Command"
+    return _OPCODE_NAMES.get(opcode, "Unknown Command")
+
+
+_RETURN_CODE_NAMES = {int(member): member.name for member in CCI_RETURN_CODE}
+
+
+def get_return_code_string(return_code: int) -> str:
+    return _RETURN_CODE_NAMES.get(return_code, "Unknown Return Code")
 
 
 class TunnelManagementTargetType(Enum):
@@ -142,57 +140,64 @@ class TunnelManagementTargetType(Enum):
     LD_POOL_CCI = 0x01
 
 
-@dataclass
+_TUNNEL_REQUEST_HEADER = struct.Struct("<BBH")
+_TUNNEL_RESPONSE_HEADER = struct.Struct("<HH")
+_EMPTY_TUNNEL_RESPONSE = bytes(_TUNNEL_RESPONSE_HEADER.size)
+
+
+@dataclass(slots=True)
 class TunnelManagementRequestPayload:
     port_or_ld_id: int = field(default=0, metadata={"offset": 0, "length": 1})
     target_type: TunnelManagementTargetType = field(
         default=TunnelManagementTargetType(0), metadata={"offset": 1, "length": 1}
     )
     command_size: int = field(default=0, metadata={"offset": 2, "length": 2})
-    command_payload: int = field(default=0, metadata={"offset": 4})
+    command_payload: bytes = field(default=b"", metadata={"offset": 4})
 
     def dump(self) -> bytes:
+        if len(self.command_payload) > self.command_size:
+            raise ValueError("Command payload is larger than the command size.")
         data = bytearray(self.command_size + 4)
-        data[0:1] = self.port_or_ld_id.to_bytes(1, "little")
-        data[1:2] = self.target_type.value.to_bytes(1, "little")
-        data[2:4] = self.command_size.to_bytes(2, "little")
-        data[4 : 4 + self.command_size] = self.command_payload.to_bytes(self.command_size, "little")
+        _TUNNEL_REQUEST_HEADER.pack_into(
+            data, 0, self.port_or_ld_id, self.target_type.value, self.command_size
+        )
+        data[4 : 4 + len(self.command_payload)] = self.command_payload
         return bytes(data)
 
     @classmethod
     def parse(cls, data: bytes):
-        port_or_ld_id = int.from_bytes(data[0:1], "little")
-        target_type = int.from_bytes(data[1:2], "little")
-        command_size = int.from_bytes(data[2:4], "little")
-        command_payload = int.from_bytes(data[4:], "little")
+        port_or_ld_id, target_type, command_size = _TUNNEL_REQUEST_HEADER.unpack_from(data, 0)
 
-        if len(data) != command_size:
+        if len(data) != command_size + 4:
             raise ValueError("Provided bytes object does not match the expected data size.")
-        return cls(port_or_ld_id, target_type, command_size, command_payload)
+        command_payload = bytes(data[4 : 4 + command_size])
+        return cls(
+            port_or_ld_id, TunnelManagementTargetType(target_type), command_size, command_payload
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class TunnelManagementResponsePayload:
     response_size: int = field(default=0, metadata={"offset": 0, "length": 2})
     reserved: int = field(default=0, metadata={"offset": 2, "length": 2})
-    payload: int = field(default=0, metadata={"offset": 4})
+    payload: bytes = field(default=b"", metadata={"offset": 4})
 
     @classmethod
     def parse(cls, data: bytes):
-        response_size = int.from_bytes(data[0:2], "little")
-        payload = int.from_bytes(data[4:], "little")
+        response_size, _ = _TUNNEL_RESPONSE_HEADER.unpack_from(data, 0)
 
         if len(data) != response_size + 4:
             raise ValueError("Provided bytes object does not match the expected data size.")
-        return cls(
-            response_size,
-            payload,
-        )
+        return cls(response_size, payload=bytes(data[4 : 4 + response_size]))
 
     def dump(self) -> bytes:
+        if len(self.payload) > self.response_size:
+            raise ValueError("Payload is larger than the response size.")
+        if self.response_size == 0:
+            return _EMPTY_TUNNEL_RESPONSE
         data = bytearray(self.response_size + 4)
-        data[0:2] = self.response_size.to_bytes(2, "little")
-        data[4 : 4 + self.response_size] = self.payload.to_bytes(self.response_size, "little")
+        _TUNNEL_RESPONSE_HEADER.pack_into(data, 0, self.response_size, 0)
+        data[4 : 4 + len(self.payload)] = self.payload
         return bytes(data)
 
     def get_pretty_print(self) -> str:
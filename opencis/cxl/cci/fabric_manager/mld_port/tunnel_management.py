@@ -5,7 +5,7 @@
  See LICENSE for details.
 """
 
-from typing import List, Optional, cast
+from typing import List, Optional
 from opencis.cxl.component.cxl_connection import CxlConnection
 from opencis.cxl.cci.common import (
     CCI_FM_API_COMMAND_OPCODE,
@@ -41,15 +41,16 @@ class TunnelManagementCommand(CciForegroundCommand):
         request_payload = self.parse_request_payload(request.payload)
         port_or_ld_id = request_payload.port_or_ld_id
 
-        real_payload = request_payload.command_payload
+        real_payload_packet = CciMessagePacket()
+        real_payload_packet.reset(request_payload.command_payload)
         connection = self._cxl_connections[port_or_ld_id]
 
-        await connection.cci_fifo.host_to_target.put(cast(CciMessagePacket, real_payload))
+        await connection.cci_fifo.host_to_target.put(real_payload_packet)
 
         dev_response: CciMessagePacket = await connection.cci_fifo.target_to_host.get()
 
         payload = TunnelManagementResponsePayload(
-            dev_response.get_size(), payload=bytes(CciMessagePacket)
+            dev_response.get_size(), payload=bytes(dev_response)
         )
 
         return CciResponse(payload=payload)
@@ -5,7 +5,7 @@
  See LICENSE for details.
 """
 
-from typing import Optional, cast
+from typing import Optional
 
 from opencis.cxl.component.physical_port_manager import PhysicalPortManager
 from opencis.cxl.component.virtual_switch_manager import VirtualSwitchManager
@@ -39,8 +39,8 @@ class TunnelManagementCommand(CciForegroundCommand):
         port_or_ld_id = request_payload.port_or_ld_id
         port_device = self._physical_port_manager.get_port_device(port_or_ld_id)
 
-        real_payload = request_payload.command_payload
-        real_payload_packet = cast(CciMessagePacket, real_payload)
+        real_payload_packet = CciMessagePacket()
+        real_payload_packet.reset(request_payload.command_payload)
         await port_device.get_downstream_connection().cci_fifo.host_to_target.put(
             real_payload_packet
         )
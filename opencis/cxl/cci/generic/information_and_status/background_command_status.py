@@ -9,8 +9,8 @@ from dataclasses import dataclass, field
 from typing import ClassVar, Optional
 from opencis.cxl.cci.common import (
     CCI_GENERIC_COMMAND_OPCODE,
-    CCI_RETURN_CODE,
     get_opcode_string,
+    get_return_code_string,
 )
 from opencis.cxl.component.cci_executor import (
     CciRequest,
@@ -105,7 +105,7 @@ class BackgroundOperationStatusResponsePayload:
             f"  - Operation In Progress: {self.background_operation_status.operation_in_progress}\n"
             f"  - Percentage Complete: {self.background_operation_status.percentage_complete}%\n"
             f"- Command Opcode: {get_opcode_string(self.command_opcode)}\n"
-            f"- Return Code: {CCI_RETURN_CODE(self.return_code).name}\n"
+            f"- Return Code: {get_return_code_string(self.return_code)}\n"
             f"- Vendor Specific Extended Status: {self.vendor_specific_extended_status}"
         )
 
@@ -246,6 +246,11 @@ class CxlBIDecoderCapabilityStructureOptions(TypedDict):
     device_type: CXL_COMPONENT_TYPE
 
 
+# Component types for which the capability bits are reserved
+_HDM_D_COMPATIBLE_RESERVED_TYPES = frozenset((CXL_COMPONENT_TYPE.DSP, CXL_COMPONENT_TYPE.R))
+_EXPLICIT_COMMIT_RESERVED_TYPES = frozenset((CXL_COMPONENT_TYPE.D2, CXL_COMPONENT_TYPE.R))
+
+
 class CxlBIDecoderCapabilityRegister(BitMaskedBitStructure):
     hdm_d_compatible: int
     explicit_bi_decoder_commit_required: int
@@ -261,32 +266,28 @@ class CxlBIDecoderCapabilityRegister(BitMaskedBitStructure):
         options = options["capability_options"]
         hdm_d_compatible = 0
         explicit_bi_decoder_commit_required = 0
+        hdm_d_compatible_attr = FIELD_ATTR.RESERVED
+        explicit_bi_decoder_commit_required_attr = FIELD_ATTR.RESERVED
 
-        if device_type not in (CXL_COMPONENT_TYPE.DSP, CXL_COMPONENT_TYPE.R):
+        if device_type not in _HDM_D_COMPATIBLE_RESERVED_TYPES:
             hdm_d_compatible = options["hdm_d_compatible"]
-        if device_type not in (CXL_COMPONENT_TYPE.D2, CXL_COMPONENT_TYPE.R):
+            hdm_d_compatible_attr = FIELD_ATTR.HW_INIT
+        if device_type not in _EXPLICIT_COMMIT_RESERVED_TYPES:
             explicit_bi_decoder_commit_required = options["explicit_bi_decoder_commit_required"]
+            explicit_bi_decoder_commit_required_attr = FIELD_ATTR.HW_INIT
         self._fields = [
             BitField(
                 "hdm_d_compatible",
                 0,
                 0,
-                (
-                    FIELD_ATTR.RESERVED
-                    if device_type in (CXL_COMPONENT_TYPE.DSP, CXL_COMPONENT_TYPE.R)
-                    else FIELD_ATTR.HW_INIT
-                ),
+                hdm_d_compatible_attr,
                 default=hdm_d_compatible,
             ),
             BitField(
                 "explicit_bi_decoder_commit_required",
                 1,
                 1,
-                (
-                    FIELD_ATTR.RESERVED
-                    if device_type in (CXL_COMPONENT_TYPE.D2, CXL_COMPONENT_TYPE.R)
-                    else FIELD_ATTR.HW_INIT
-                ),
+                explicit_bi_decoder_commit_required_attr,
                 default=explicit_bi_decoder_commit_required,
             ),
             BitField("reserved", 2, 31, FIELD_ATTR.RESERVED),
@@ -311,7 +312,7 @@ class CxlBIDecoderControlRegister(BitMaskedBitStructure):
 
         device_type = options["device_type"]
         explicit_bi_decoder_commit_required = 0
-        if device_type not in (CXL_COMPONENT_TYPE.D2, CXL_COMPONENT_TYPE.R):
+        if device_type not in _EXPLICIT_COMMIT_RESERVED_TYPES:
             explicit_bi_decoder_commit_required = options["capability_options"][
                 "explicit_bi_decoder_commit_required"
             ]
@@ -11,7 +11,7 @@ from dataclasses import dataclass, field
 import traceback
 from typing import Dict, Optional, Callable, Awaitable, cast
 
-from opencis.cxl.cci.common import CCI_RETURN_CODE, get_opcode_string
+from opencis.cxl.cci.common import CCI_RETURN_CODE, get_opcode_string, get_return_code_string
 from opencis.util.component import LabeledComponent, RunnableComponent
 from opencis.util.logger import logger
 
@@ -131,7 +131,7 @@ class CciExecutor(RunnableComponent):
             logger.debug(self._create_message(f"Received command {opcode_string}"))
             foreground_command = cast(CciForegroundCommand, command)
             response = await foreground_command.execute(request)
-            return_code_str = CCI_RETURN_CODE(response.return_code).name
+            return_code_str = get_return_code_string(response.return_code)
             logger.debug(self._create_message(f"Command Return Status: {return_code_str}"))
         return response
 
@@ -7,7 +7,7 @@
 
 import asyncio
 from dataclasses import dataclass, field
-from typing import Callable, List
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 from opencis.cxl.component.irq_manager import Irq, IrqManager
 from opencis.util.component import RunnableComponent
 from opencis.cxl.component.root_complex.root_complex import (
@@ -55,6 +55,7 @@ class CxlMemoryHub(RunnableComponent):
         super().__init__(lambda class_name: f"{config.host_name}:{class_name}")
 
         self._processor_to_cache_fifo = MemoryFifoPair()
+        self._processor_to_cache_lock = asyncio.Lock()
         cache_to_home_agent_fifo = CacheFifoPair()
         home_agent_to_cache_fifo = CacheFifoPair()
         cache_to_coh_bridge_fifo = CacheFifoPair()
@@ -163,20 +164,54 @@ class CxlMemoryHub(RunnableComponent):
         )
 
     async def _send_mem_request(self, packet: MemoryRequest) -> MemoryResponse:
-        await self._processor_to_cache_fifo.request.put(packet)
-        resp = await self._processor_to_cache_fifo.response.get()
+        async with self._processor_to_cache_lock:
+            await self._processor_to_cache_fifo.request.put(packet)
+            resp = await self._processor_to_cache_fifo.response.get()
         assert resp.status == MEMORY_RESPONSE_STATUS.OK
+        # NOTE: The cache controller is done with a request once it has responded
+        packet.release()
         return resp
 
+    async def _send_mem_requests(self, packets: List[MemoryRequest]) -> List[int]:
+        # NOTE: Responses are matched to requests by order, so the whole batch is
+        # queued and drained while holding the FIFO
+        data = []
+        async with self._processor_to_cache_lock:
+            for packet in packets:
+                self._processor_to_cache_fifo.request.put_nowait(packet)
+            for packet in packets:
+                resp = await self._processor_to_cache_fifo.response.get()
+                assert resp.status == MEMORY_RESPONSE_STATUS.OK
+                packet.release()
+                data.append(resp.data)
+        return data
+
+    def _get_bulk_request_type(
+        self, addr: int, size: int, is_write: bool
+    ) -> Optional[MEMORY_REQUEST_TYPE]:
+        mem_range = self._cache_controller.get_mem_range(addr)
+        if mem_range is None or addr + size > mem_range.base_addr + mem_range.size:
+            return None
+        match mem_range.addr_type:
+            case MEM_ADDR_TYPE.DRAM | MEM_ADDR_TYPE.CXL_CACHED | MEM_ADDR_TYPE.CXL_CACHED_BI:
+                if is_write:
+                    return MEMORY_REQUEST_TYPE.WRITE
+                return MEMORY_REQUEST_TYPE.READ
+            case MEM_ADDR_TYPE.CXL_UNCACHED:
+                if is_write:
+                    return MEMORY_REQUEST_TYPE.UNCACHED_WRITE
+                return MEMORY_REQUEST_TYPE.UNCACHED_READ
+        return None
+
     async def load(self, addr: int, size: int) -> int:
         addr_type = self._cache_controller.get_mem_addr_type(addr)
         match addr_type:
             case MEM_ADDR_TYPE.DRAM | MEM_ADDR_TYPE.CXL_CACHED | MEM_ADDR_TYPE.CXL_CACHED_BI:
-                packet = MemoryRequest(MEMORY_REQUEST_TYPE.READ, addr, size)
+                packet = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.READ, addr, size)
                 resp = await self._send_mem_request(packet)
                 return resp.data
             case MEM_ADDR_TYPE.CXL_UNCACHED:
-                packet = MemoryRequest(MEMORY_REQUEST_TYPE.UNCACHED_READ, addr, size)
+                packet = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.UNCACHED_READ, addr, size)
                 resp = await self._send_mem_request(packet)
                 return resp.data
             case MEM_ADDR_TYPE.MMIO:
@@ -192,10 +227,10 @@ class CxlMemoryHub(RunnableComponent):
         addr_type = self._cache_controller.get_mem_addr_type(addr)
         match addr_type:
             case MEM_ADDR_TYPE.DRAM | MEM_ADDR_TYPE.CXL_CACHED | MEM_ADDR_TYPE.CXL_CACHED_BI:
-                packet = MemoryRequest(MEMORY_REQUEST_TYPE.WRITE, addr, size, data)
+                packet = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.WRITE, addr, size, data)
                 await self._send_mem_request(packet)
             case MEM_ADDR_TYPE.CXL_UNCACHED:
-                packet = MemoryRequest(MEMORY_REQUEST_TYPE.UNCACHED_WRITE, addr, size, data)
+                packet = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.UNCACHED_WRITE, addr, size, data)
                 await self._send_mem_request(packet)
             case MEM_ADDR_TYPE.MMIO:
                 await self._root_complex.write_mmio(addr, size, data)
@@ -207,6 +242,48 @@ class CxlMemoryHub(RunnableComponent):
                 return False
         return True
 
+    async def store_bytes(self, addr: int, data: Union[bytes, memoryview]):
+        if addr % 64:
+            raise Exception("Address must be aligned to 64!")
+
+        size = len(data)
+        request_type = self._get_bulk_request_type(addr, size, is_write=True)
+        if request_type is None:
+            # NOTE: The last cacheline is zero-padded up to 64 bytes
+            with memoryview(data) as view:
+                for offset in range(0, size, 64):
+                    cacheline = int.from_bytes(view[offset : offset + 64], "little")
+                    if not await self.store(addr + offset, 64, cacheline):
+                        return False
+            return True
+
+        with memoryview(data) as view:
+            packets = [
+                MemoryRequest.acquire(
+                    request_type,
+                    addr + offset,
+                    64,
+                    int.from_bytes(view[offset : offset + 64], "little"),
+                )
+                for offset in range(0, size, 64)
+            ]
+        await self._send_mem_requests(packets)
+        return True
+
+    async def load_bytes(self, addr: int, size: int) -> bytes:
+        request_type = self._get_bulk_request_type(addr, size, is_write=False)
+        if request_type is None:
+            cachelines = [await self.load(addr + offset, 64) for offset in range(0, size, 64)]
+        else:
+            cachelines = await self._send_mem_requests(
+                [
+                    MemoryRequest.acquire(request_type, addr + offset, 64)
+                    for offset in range(0, size, 64)
+                ]
+            )
+        data = b"".join(cacheline.to_bytes(64, "little") for cacheline in cachelines)
+        return data[:size]
+
     def get_root_complex(self):
         return self._root_complex
 
@@ -225,6 +302,12 @@ class CxlMemoryHub(RunnableComponent):
     async def read_mmio(self, address: int, size: int) -> int:
         return await self._root_complex.read_mmio(address, size)
 
+    async def write_mmio_batch(self, writes: Iterable[Tuple[int, int, int]]):
+        await self._root_complex.write_mmio_batch(writes)
+
+    async def read_mmio_batch(self, reads: Iterable[Tuple[int, int]]) -> Optional[List[int]]:
+        return await self._root_complex.read_mmio_batch(reads)
+
     async def _run(self):
         run_tasks = [
             asyncio.create_task(self._root_port_client_manager.run()),
@@ -36,6 +36,7 @@ from opencis.cxl.transport.transaction import (
     GetLdInfoResponsePacket,
     GetLdAllocationsResponsePacket,
     SetLdAllocationsResponsePacket,
+    PooledCciPacket,
 )
 from opencis.cxl.device.cxl_type3_device import CXL_T3_DEV_TYPE
 from opencis.cxl.component.fmld import FMLD
@@ -418,6 +419,7 @@ class CxlPacketProcessor(RunnableComponent):
                 if opcode == CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO:
                     packet = cast(GetLdInfoResponsePacket, packet)
                     self._writer.write(bytes(packet))
+                    packet.release()
                     await self._writer.drain()
                 elif opcode == CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS:
                     packet = cast(GetLdAllocationsResponsePacket, packet)
@@ -434,6 +436,8 @@ class CxlPacketProcessor(RunnableComponent):
                 if self._is_disconnection_notification(packet):
                     break
                 self._writer.write(bytes(packet))
+                if isinstance(packet, PooledCciPacket):
+                    packet.release()
                 await self._writer.drain()
             else:
                 break
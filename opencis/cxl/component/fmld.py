@@ -5,8 +5,10 @@
  See LICENSE for details.
 """
 
+from array import array
 from asyncio import create_task, gather
-from typing import Optional, cast, List
+import sys
+from typing import Iterable, Optional, cast, List
 from opencis.cxl.cci.common import CCI_FM_API_COMMAND_OPCODE
 from opencis.util.component import RunnableComponent
 from opencis.util.logger import logger
@@ -23,6 +25,21 @@ from opencis.cxl.transport.transaction import (
 )
 
 
+def _unpack_ld_allocation_list(data: bytes) -> array:
+    # NOTE: Allocation multipliers are little-endian 8-byte values on the wire
+    values = array("Q", data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _pack_ld_allocation_list(values: Iterable[int]) -> bytes:
+    values = array("Q", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
 class FMLD(RunnableComponent):
     def __init__(
         self,
@@ -105,14 +122,14 @@ class FMLD(RunnableComponent):
             elif self._ld_dict.get(start_ld_id + i) == 0:
                 break
 
-        allocated_ld_bytes = b"".join(num.to_bytes(8, "little") for num in allocated_ld)
+        allocated_ld_bytes = _pack_ld_allocation_list(allocated_ld)
 
         get_ld_allocations_response_packet = GetLdAllocationsResponsePacket.create(
             number_of_lds=number_of_lds,
             memory_granularity=0,
             start_ld_id=start_ld_id,
             ld_allocation_list_length=allocated_ld_length,
-            ld_allocation_list=int.from_bytes(allocated_ld_bytes, "little"),
+            ld_allocation_list=allocated_ld_bytes,
             message_tag=get_ld_allocations_packet.header_data.message_tag,
         )
 
@@ -132,12 +149,9 @@ class FMLD(RunnableComponent):
         number_of_lds = set_ld_allocations_packet.get_number_of_lds()
         start_ld_id = set_ld_allocations_packet.get_start_ld_id()
 
-        ld_allocation_list = set_ld_allocations_packet.get_ld_allocation_list()
-
-        ld_allocation_list = [
-            int.from_bytes(ld_allocation_list[i : i + 8], "little")
-            for i in range(0, len(ld_allocation_list), 8)
-        ]
+        ld_allocation_list = _unpack_ld_allocation_list(
+            set_ld_allocations_packet.get_ld_allocation_list()
+        )
 
         # Boundary check
         if len(self._ld_dict) - start_ld_id < number_of_lds:
@@ -165,15 +179,12 @@ class FMLD(RunnableComponent):
 
         response_ld_allocated_list = [1, 0] * len(response_ld_allocated_list)
 
-        response_ld_allocated_bytes = b"".join(
-            num.to_bytes(8, "little") for num in response_ld_allocated_list
-        )
-        ld_allocation_list = int.from_bytes(response_ld_allocated_bytes, "little")
+        response_ld_allocated_bytes = _pack_ld_allocation_list(response_ld_allocated_list)
 
         set_ld_allocations_response_packet = SetLdAllocationsResponsePacket.create(
             number_of_lds=response_number_of_lds,
             start_ld_id=start_ld_id,
-            ld_allocation_list=ld_allocation_list,
+            ld_allocation_list=response_ld_allocated_bytes,
             message_tag=set_ld_allocations_packet.header_data.message_tag,
         )
         await self.upstream_fifo.target_to_host.put(set_ld_allocations_response_packet)
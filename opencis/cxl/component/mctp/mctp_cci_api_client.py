@@ -15,7 +15,7 @@ from opencis.cxl.transport.transaction import (
     CCI_MCTP_MESSAGE_CATEGORY,
     CciPayloadPacket,
 )
-from opencis.cxl.cci.common import get_opcode_string
+from opencis.cxl.cci.common import get_opcode_string, get_return_code_string
 from opencis.cxl.cci.generic.information_and_status import (
     BackgroundOperationStatusCommand,
     BackgroundOperationStatusResponsePayload,
@@ -128,7 +128,7 @@ class MctpCciApiClient(RunnableComponent):
             return response
 
         if response.header.return_code != CCI_RETURN_CODE.SUCCESS:
-            return_code_str = CCI_RETURN_CODE(response.header.return_code).name
+            return_code_str = get_return_code_string(response.header.return_code)
             message = f"Command failed with status: {return_code_str}"
             logger.debug(self._create_message(message))
 
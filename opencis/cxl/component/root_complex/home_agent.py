@@ -132,12 +132,15 @@ class HomeAgent(RunnableComponent):
         if addr % 64 != 0 or size % 64 != 0:
             raise Exception("Size and address must be aligned to 64!")
 
-        chunk_count = 0
-        while size > 0:
-            message = self._create_message(f"CXL.mem: Writing 0x{value:08x} to 0x{addr:08x}")
+        # NOTE: Converting once avoids shifting the whole value for every cacheline
+        data = (value & ((1 << (size * 8)) - 1)).to_bytes(size, "little")
+        for offset in range(0, size, 64):
+            cacheline = int.from_bytes(data[offset : offset + 64], "little")
+            message = self._create_message(
+                f"CXL.mem: Writing 0x{cacheline:08x} to 0x{addr + offset:08x}"
+            )
             logger.debug(message)
-            low_64_byte = value & ((1 << (64 * 8)) - 1)
-            packet = CxlMemMemWrPacket.create(addr + (chunk_count * 64), low_64_byte)
+            packet = CxlMemMemWrPacket.create(addr + offset, cacheline)
             await self._downstream_cxl_mem_fifos.host_to_target.put(packet)
             try:
                 async with asyncio.timeout(3):
@@ -145,9 +148,6 @@ class HomeAgent(RunnableComponent):
             except asyncio.exceptions.TimeoutError:
                 logger.error(self._create_message("CXL.mem Write: Timed-out"))
                 return
-            size -= 64
-            chunk_count += 1
-            value >>= 64 * 8
 
     async def read_cxl_mem(self, addr: int, size: int) -> int:
         if addr % 64 or size % 64:
@@ -228,8 +228,6 @@ class HomeAgent(RunnableComponent):
 
         if s2mndr_packet.s2mndr_header.meta_value == CXL_MEM_META_VALUE.ANY:
             # HDM-DB: DRS immediately following NDR as part of one response
-            while self._cxl_channel.s2m_drs.empty():
-                await asyncio.sleep(0)  # just spin
             cxl_packet = await self._cxl_channel.s2m_drs.get()
             assert cast(CxlMemBasePacket, cxl_packet).is_s2mdrs()
             cache_packet = CacheResponse(status, cxl_packet.data)
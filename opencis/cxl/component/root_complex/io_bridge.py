@@ -6,8 +6,8 @@
 """
 
 from dataclasses import dataclass
-from typing import cast
-from asyncio import Queue, create_task, gather, timeout, exceptions
+from typing import Dict, Iterable, List, Optional, Tuple, cast
+from asyncio import Future, create_task, gather, get_running_loop, timeout, exceptions
 from opencis.util.component import RunnableComponent
 from opencis.pci.component.fifo_pair import FifoPair
 from opencis.cxl.transport.memory_fifo import MemoryFifoPair
@@ -27,6 +27,9 @@ from opencis.cxl.transport.transaction import (
     is_cxl_io_completion_status_sc,
 )
 
+# NOTE: CXL.io requests carry an 8-bit tag, so at most this many reads can be outstanding
+MMIO_TAG_COUNT = 256
+
 
 @dataclass
 class IoBridgeConfig:
@@ -46,12 +49,19 @@ class IoBridge(RunnableComponent):
         self._memory_producer_fifos = config.memory_producer_fifos
         self._next_tag = 0
 
-        self._internal_io_fifo = Queue()
+        # Key: tag of an outstanding MMIO read, value: future resolved with its completion
+        self._mmio_reads: Dict[int, Future] = {}
 
     # pylint: disable=unused-argument
-    async def _get_mmio_response(self, tag: int):
-        # TODO: get packet based on tag
-        packet = await self._internal_io_fifo.get()
+    def _expect_mmio_response(self, tag: int) -> Future:
+        if tag in self._mmio_reads:
+            raise Exception(f"MMIO read tag {tag} is still outstanding")
+        response = get_running_loop().create_future()
+        self._mmio_reads[tag] = response
+        return response
+
+    async def _get_mmio_response(self, response: Future):
+        packet = await response
 
         assert is_cxl_io_completion_status_sc(packet)
         return packet
@@ -167,19 +177,62 @@ class IoBridge(RunnableComponent):
         message = self._create_message(f"MMIO: Reading data from 0x{address:08x}")
         logger.debug(message)
         packet = CxlIoMemRdPacket.create(address, size)
+        tag = packet.mreq_header.tag
+        response = self._expect_mmio_response(tag)
         await self._cxl_io_mmio_fifos.host_to_target.put(packet)
 
         try:
             async with timeout(10):
-                packet = await self._get_mmio_response(packet.mreq_header.tag)
+                packet = await self._get_mmio_response(response)
 
         except exceptions.TimeoutError:
             logger.error(self._create_message("CXL.io mmio RD: Timed-out"))
+            self._mmio_reads.pop(tag, None)
             return None
 
         cpld_packet = cast(CxlIoCompletionWithDataPacket, packet)
         return cpld_packet.data
 
+    async def write_mmio_batch(self, writes: Iterable[Tuple[int, int, int]]):
+        for address, size, value in writes:
+            await self.write_mmio(address, size, value)
+
+    async def read_mmio_batch(self, reads: Iterable[Tuple[int, int]]) -> Optional[List[int]]:
+        # NOTE: Reads are issued in groups of at most MMIO_TAG_COUNT, and each group is
+        # completed before the next one is issued so that no outstanding tag is reused
+        reads = list(reads)
+        data = []
+        for start in range(0, len(reads), MMIO_TAG_COUNT):
+            group_data = await self._read_mmio_group(reads[start : start + MMIO_TAG_COUNT])
+            if group_data is None:
+                return None
+            data.extend(group_data)
+        return data
+
+    async def _read_mmio_group(self, reads: List[Tuple[int, int]]) -> Optional[List[int]]:
+        responses = {}
+        try:
+            for address, size in reads:
+                logger.debug(self._create_message(f"MMIO: Reading data from 0x{address:08x}"))
+                packet = CxlIoMemRdPacket.create(address, size)
+                tag = packet.mreq_header.tag
+                responses[tag] = self._expect_mmio_response(tag)
+                await self._cxl_io_mmio_fifos.host_to_target.put(packet)
+
+            data = []
+            async with timeout(10):
+                for response in responses.values():
+                    packet = await self._get_mmio_response(response)
+                    data.append(cast(CxlIoCompletionWithDataPacket, packet).data)
+            return data
+        except exceptions.TimeoutError:
+            logger.error(self._create_message("CXL.io mmio RD: Timed-out"))
+            return None
+        finally:
+            for tag, response in responses.items():
+                if self._mmio_reads.get(tag) is response:
+                    del self._mmio_reads[tag]
+
     # pylint: enable=duplicate-code
 
     async def process_target_to_host_mmio_packets(self):
@@ -188,7 +241,11 @@ class IoBridge(RunnableComponent):
             if packet is None:
                 logger.debug(self._create_message("Stopped processing target to host MMIO packets"))
                 break
-            await self._internal_io_fifo.put(packet)
+            response = self._mmio_reads.pop(packet.cpl_header.tag, None)
+            if response is None or response.done():
+                logger.warning(self._create_message("Dropped unexpected MMIO completion"))
+                continue
+            response.set_result(packet)
 
     async def _run(self):
         tasks = [create_task(self.process_target_to_host_mmio_packets())]
@@ -5,7 +5,7 @@
  See LICENSE for details.
 """
 
-from typing import Optional, List
+from typing import Iterable, Optional, List, Tuple
 from dataclasses import dataclass, field
 import asyncio
 from opencis.util.component import RunnableComponent
@@ -149,6 +149,12 @@ class RootComplex(RunnableComponent):
     async def read_mmio(self, address: int, size: int) -> int:
         return await self._io_bridge.read_mmio(address, size)
 
+    async def write_mmio_batch(self, writes: Iterable[Tuple[int, int, int]]):
+        await self._io_bridge.write_mmio_batch(writes)
+
+    async def read_mmio_batch(self, reads: Iterable[Tuple[int, int]]) -> Optional[List[int]]:
+        return await self._io_bridge.read_mmio_batch(reads)
+
     async def write_cxl_mem(self, address: int, size: int, value: int) -> int:
         return await self._home_agent.write_cxl_mem(address, size, value)
 
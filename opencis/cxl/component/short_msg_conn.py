@@ -63,7 +63,7 @@ class ShortMsgConn(RunnableComponent):
         self._writer_id = {}
         self._device_id = device_id
         self._run_status = False
-        self._msg_tasks: list[Task] = []
+        self._msg_tasks: set[Task] = set()
         self._msg_type = msg_type
 
     def register_interrupt_handler(
@@ -79,10 +79,6 @@ class ShortMsgConn(RunnableComponent):
             dev_id = 0
             device_name = "host"
 
-        async def _callback(dev_id):
-            await msg_recv_cb(dev_id)
-
-        cb_func = _callback
         logger.debug(
             self._create_message(
                 f"Registering callback for ShortMsg {short_msg.name} for remote {device_name}"
@@ -90,7 +86,7 @@ class ShortMsgConn(RunnableComponent):
         )
         if dev_id not in self._msg_to_interrupt_event:
             self._msg_to_interrupt_event[dev_id] = {}
-        self._msg_to_interrupt_event[dev_id][short_msg] = cb_func
+        self._msg_to_interrupt_event[dev_id][short_msg] = msg_recv_cb
 
     def register_general_handler(
         self, short_msg: ShortMsgBase, msg_recv_cb: Callable, persistent: bool = True
@@ -141,21 +137,26 @@ class ShortMsgConn(RunnableComponent):
                 persistent = self._general_interrupt_event[msg][1]
                 if not persistent:
                     del self._general_interrupt_event[msg]
-                t = create_task(func(remote_dev_id, msg))
-                self._msg_tasks.append(t)
+                self._track_msg_task(create_task(func(remote_dev_id, msg)))
                 continue
 
             if msg not in self._msg_to_interrupt_event[remote_dev_id]:
                 raise RuntimeError(f"Invalid ShortMsg: {msg} for remote {remote_dev_name}")
 
-            t = create_task(self._msg_to_interrupt_event[remote_dev_id][msg](remote_dev_id))
-            self._msg_tasks.append(t)
+            self._track_msg_task(
+                create_task(self._msg_to_interrupt_event[remote_dev_id][msg](remote_dev_id))
+            )
             logger.debug(
                 self._create_message(
                     f"ShortMsg handled for {msg.name} from remote {remote_dev_name}"
                 )
             )
 
+    def _track_msg_task(self, task: Task):
+        # NOTE: Finished handler tasks are dropped so the set only holds the ones in flight
+        self._msg_tasks.add(task)
+        task.add_done_callback(self._msg_tasks.discard)
+
     async def _create_server(self):
         self._run_status = True
 
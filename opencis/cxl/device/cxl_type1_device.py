@@ -225,28 +225,29 @@ class CxlType1Device(RunnableComponent):
         await self._cache_controller.cache_coherent_store(addr, 64, data)
 
     async def cxl_cache_read(self, address, size) -> bytes:
-        end = address + size
-        result = b""
-        for cacheline_offset in range(address, address + size, 64):
-            cacheline = await self.cxl_cache_readline(cacheline_offset)
-            chunk_size = min(64, (end - cacheline_offset))
-            chunk_data = cacheline.to_bytes(64, "little")
-            result += chunk_data[:chunk_size]
-        return result
+        result = bytearray(size)
+        with memoryview(result) as view:
+            for offset in range(0, size, 64):
+                cacheline = await self.cxl_cache_readline(address + offset)
+                chunk_size = min(64, size - offset)
+                view[offset : offset + chunk_size] = cacheline.to_bytes(64, "little")[:chunk_size]
+        return bytes(result)
 
     async def cxl_cache_write(self, address, size, value):
         if address % 64 != 0 or size % 64 != 0:
             raise Exception(f"Size {size} and address 0x{address:x} must be aligned to 64!")
 
-        chunk_count = 0
-        while size > 0:
-            message = self._create_message(f"Host Memory: Writing 0x{value:08x} to 0x{address:08x}")
+        if isinstance(value, int):
+            data = (value & ((1 << (size * 8)) - 1)).to_bytes(size, "little")
+        else:
+            data = bytes(value[:size]).ljust(size, b"\x00")
+        for offset in range(0, size, 64):
+            cacheline = int.from_bytes(data[offset : offset + 64], "little")
+            message = self._create_message(
+                f"Host Memory: Writing 0x{cacheline:08x} to 0x{address + offset:08x}"
+            )
             logger.debug(message)
-            low_64_byte = value & ((1 << (64 * 8)) - 1)
-            await self.cxl_cache_writeline(address + (chunk_count * 64), low_64_byte)
-            size -= 64
-            chunk_count += 1
-            value >>= 64 * 8
+            await self.cxl_cache_writeline(address + offset, cacheline)
 
     async def _run(self):
         # pylint: disable=duplicate-code
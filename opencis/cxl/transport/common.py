@@ -6,6 +6,8 @@
 """
 
 from enum import IntEnum
+import struct
+from typing import Optional, Tuple
 
 from opencis.util.unaligned_bit_structure import (
     UnalignedBitStructure,
@@ -41,6 +43,12 @@ class SystemHeaderPacket(UnalignedBitStructure):
 SYSTEM_HEADER_START = 0x00
 SYSTEM_HEADER_END = SystemHeaderPacket.get_size() - 1
 
+# NOTE: System header word followed by the port_index / msg_class bytes that
+# start the CXL.cache, CXL.mem and CCI headers
+PACKET_HEADERS_FORMAT = struct.Struct("<HBB")
+PAYLOAD_TYPE_MASK = 0xF
+PAYLOAD_LENGTH_MASK = 0xFFF
+
 
 class BasePacket(UnalignedBitStructure):
     system_header: SystemHeaderPacket
@@ -53,20 +61,44 @@ class BasePacket(UnalignedBitStructure):
         )
     ]
 
+    def _write_headers(self, payload_type: PAYLOAD_TYPE, msg_class: int, port_index: int = 0):
+        payload_length = len(self)
+        if payload_length > PAYLOAD_LENGTH_MASK:
+            raise Exception(f"Packet length {payload_length} does not fit in payload_length")
+        self._data.pack_into(
+            PACKET_HEADERS_FORMAT,
+            SYSTEM_HEADER_START,
+            payload_type | payload_length << 4,
+            port_index,
+            msg_class,
+        )
+
+    def unpack_header(self, fmt: struct.Struct) -> Optional[Tuple]:
+        # NOTE: Unpacks fmt from the start of the packet, None if the packet is shorter
+        if len(self) < fmt.size:
+            return None
+        return self._data.unpack_from(fmt)
+
+    def get_payload_type(self) -> PAYLOAD_TYPE:
+        # NOTE: payload_type is the low nibble of the first byte, read straight from
+        # the buffer so that it always reflects the current header
+        payload_type = self._data.read_bytes(SYSTEM_HEADER_START, SYSTEM_HEADER_START)
+        return PAYLOAD_TYPE(payload_type & PAYLOAD_TYPE_MASK)
+
     def is_cxl_io(self) -> bool:
-        return self.system_header.payload_type == PAYLOAD_TYPE.CXL_IO
+        return self.get_payload_type() == PAYLOAD_TYPE.CXL_IO
 
     def is_cxl_mem(self) -> bool:
-        return self.system_header.payload_type == PAYLOAD_TYPE.CXL_MEM
+        return self.get_payload_type() == PAYLOAD_TYPE.CXL_MEM
 
     def is_cxl_cache(self) -> bool:
-        return self.system_header.payload_type == PAYLOAD_TYPE.CXL_CACHE
+        return self.get_payload_type() == PAYLOAD_TYPE.CXL_CACHE
 
     def is_cci(self) -> bool:
-        return self.system_header.payload_type == PAYLOAD_TYPE.CCI_MCTP
+        return self.get_payload_type() == PAYLOAD_TYPE.CCI_MCTP
 
     def is_sideband(self) -> bool:
-        return self.system_header.payload_type == PAYLOAD_TYPE.SIDEBAND
+        return self.get_payload_type() == PAYLOAD_TYPE.SIDEBAND
 
     def get_type(self) -> str:
         return self.__class__.__name__
@@ -6,8 +6,10 @@
 """
 
 from asyncio import Queue
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from typing import ClassVar
 
 
 class MEMORY_REQUEST_TYPE(Enum):
@@ -24,6 +26,27 @@ class MemoryRequest:
     size: int
     data: int = 0
 
+    _pool: ClassVar[deque] = deque()
+    _POOL_SIZE: ClassVar[int] = 1024
+
+    @classmethod
+    def acquire(
+        cls, request_type: MEMORY_REQUEST_TYPE, addr: int, size: int, data: int = 0
+    ) -> "MemoryRequest":
+        try:
+            packet = cls._pool.pop()
+        except IndexError:
+            return cls(request_type, addr, size, data)
+        packet.type = request_type
+        packet.addr = addr
+        packet.size = size
+        packet.data = data
+        return packet
+
+    def release(self):
+        if len(self._pool) < self._POOL_SIZE:
+            self._pool.append(self)
+
 
 class MEMORY_RESPONSE_STATUS(Enum):
     OK = auto()
@@ -5,8 +5,11 @@
  See LICENSE for details.
 """
 
+from array import array
+from collections import deque
 from enum import IntEnum
-from typing import cast, Optional
+import struct
+from typing import cast, Iterable, List, Optional
 
 from opencis.cxl.cci.common import CCI_FM_API_COMMAND_OPCODE
 from opencis.util.unaligned_bit_structure import (
@@ -1145,9 +1148,7 @@ class CxlCacheCacheD2HReqPacket(CxlCacheD2HReqPacket):
         cqid: int = 0,
     ) -> "CxlCacheCacheD2HReqPacket":
         packet = CxlCacheCacheD2HReqPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.D2H_REQ
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.D2H_REQ)
         packet.d2hreq_header.valid = 0b1
         packet.d2hreq_header.cache_opcode = opcode
         packet.d2hreq_header.cqid = cqid
@@ -1163,9 +1164,7 @@ class CxlCacheCacheD2HRspPacket(CxlCacheD2HRspPacket):
     # read length is assumed to be 64 for now
     def create(uqid: int, opcode: CXL_CACHE_D2HRSP_OPCODE) -> "CxlCacheCacheD2HRspPacket":
         packet = CxlCacheCacheD2HRspPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.D2H_RSP
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.D2H_RSP)
         packet.d2hrsp_header.valid = 0b1
         packet.d2hrsp_header.uqid = uqid
         packet.d2hrsp_header.cache_opcode = opcode
@@ -1176,9 +1175,7 @@ class CxlCacheCacheD2HDataPacket(CxlCacheD2HDataPacket):
     @staticmethod
     def create(uqid: int, data: int) -> "CxlCacheCacheD2HDataPacket":
         packet = CxlCacheCacheD2HDataPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.D2H_DATA
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.D2H_DATA)
         packet.d2hdata_header.valid = 0b1
         packet.d2hdata_header.uqid = uqid
         packet.d2hdata_header.poison = 0b0
@@ -1193,9 +1190,7 @@ class CxlCacheCacheH2DReqPacket(CxlCacheH2DReqPacket):
         addr: int, cache_id: int, opcode: CXL_CACHE_H2DREQ_OPCODE
     ) -> "CxlCacheCacheH2DReqPacket":
         packet = CxlCacheCacheH2DReqPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.H2D_REQ
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.H2D_REQ)
         packet.h2dreq_header.valid = 0b1
         packet.h2dreq_header.cache_opcode = opcode
         packet.h2dreq_header.cache_id = cache_id
@@ -1215,9 +1210,7 @@ class CxlCacheCacheH2DRspPacket(CxlCacheH2DRspPacket):
         cqid: int = 0,
     ) -> "CxlCacheCacheH2DRspPacket":
         packet = CxlCacheCacheH2DRspPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.H2D_RSP
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.H2D_RSP)
         packet.h2drsp_header.valid = 0b1
         packet.h2drsp_header.cache_opcode = opcode
         packet.h2drsp_header.cache_id = cache_id
@@ -1230,9 +1223,7 @@ class CxlCacheCacheH2DDataPacket(CxlCacheH2DDataPacket):
     @staticmethod
     def create(cache_id: int, data: int, cqid: int = 0) -> "CxlCacheCacheH2DDataPacket":
         packet = CxlCacheCacheH2DDataPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_cache_header.msg_class = CXL_CACHE_MSG_CLASS.H2D_DATA
+        packet._write_headers(PAYLOAD_TYPE.CXL_CACHE, CXL_CACHE_MSG_CLASS.H2D_DATA)
         packet.h2ddata_header.valid = 0b1
         packet.h2ddata_header.cache_id = cache_id
         packet.h2ddata_header.cqid = cqid
@@ -1240,18 +1231,33 @@ class CxlCacheCacheH2DDataPacket(CxlCacheH2DDataPacket):
         return packet
 
 
+# Byte 0 carries payload_type in its low nibble, byte 3 is cxl_cache_header.msg_class
+# and bit 0 of byte 4 is the valid bit of the H2D and D2H data headers.
+CXL_CACHE_CLASSWORD_FORMAT = struct.Struct("<B2xBB")
+
+
+def build_cxl_cache_classword(msg_class: CXL_CACHE_MSG_CLASS, valid: int = 1) -> int:
+    return (PAYLOAD_TYPE.CXL_CACHE << 16) | (msg_class << 8) | valid
+
+
+def get_cxl_cache_classword(packet: BasePacket) -> int:
+    header = packet.unpack_header(CXL_CACHE_CLASSWORD_FORMAT)
+    if header is None:
+        return 0
+    byte0, msg_class, byte4 = header
+    return ((byte0 & 0xF) << 16) | (msg_class << 8) | (byte4 & 0x1)
+
+
+CXL_CACHE_CLASSWORD_H2D_DATA = build_cxl_cache_classword(CXL_CACHE_MSG_CLASS.H2D_DATA)
+CXL_CACHE_CLASSWORD_D2H_DATA = build_cxl_cache_classword(CXL_CACHE_MSG_CLASS.D2H_DATA)
+
+
 def is_cxl_cache_h2d_data(packet: BasePacket) -> bool:
-    if not packet.is_cxl_cache():
-        return False
-    cxl_cache_packet = cast(CxlCacheH2DDataPacket, packet)
-    return cxl_cache_packet.is_h2ddata() and cxl_cache_packet.h2ddata_header.valid == 1
+    return get_cxl_cache_classword(packet) == CXL_CACHE_CLASSWORD_H2D_DATA
 
 
 def is_cxl_cache_d2h_data(packet: BasePacket) -> bool:
-    if not packet.is_cxl_cache():
-        return False
-    cxl_cache_packet = cast(CxlCacheD2HDataPacket, packet)
-    return cxl_cache_packet.is_d2hdata() and cxl_cache_packet.d2hdata_header.valid == 1
+    return get_cxl_cache_classword(packet) == CXL_CACHE_CLASSWORD_D2H_DATA
 
 
 #
@@ -1664,9 +1670,7 @@ class CxlMemMemRdPacket(CxlMemM2SReqPacket):
         ld_id: int = 0,
     ) -> "CxlMemMemRdPacket":
         packet = CxlMemMemRdPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.M2S_REQ
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.M2S_REQ)
         packet.m2sreq_header.valid = 0b1
         packet.m2sreq_header.mem_opcode = opcode
         packet.m2sreq_header.meta_field = meta_field
@@ -1691,9 +1695,7 @@ class CxlMemMemWrPacket(CxlMemM2SRwDPacket):
         ld_id: int = 0,
     ) -> "CxlMemMemWrPacket":
         packet = CxlMemMemWrPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.M2S_RWD
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.M2S_RWD)
         packet.m2srwd_header.valid = 0b1
         packet.m2srwd_header.mem_opcode = opcode
         packet.m2srwd_header.meta_field = meta_field
@@ -1713,9 +1715,7 @@ class CxlMemBIRspPacket(CxlMemM2SBIRspPacket):
         opcode: CXL_MEM_M2SBIRSP_OPCODE, bi_id: int = 0, bi_tag: int = 0
     ) -> "CxlMemBIRspPacket":
         packet = CxlMemBIRspPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.M2S_BIRSP
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.M2S_BIRSP)
         packet.m2sbirsp_header.valid = 0b1
         packet.m2sbirsp_header.opcode = opcode
         packet.m2sbirsp_header.low_addr = 0b0
@@ -1724,14 +1724,16 @@ class CxlMemBIRspPacket(CxlMemM2SBIRspPacket):
         return packet
 
 
-class CxlMemBISnpPacket(CxlMemS2MBISnpPacket):
-    tag: int = 0
+# BI tags are 12 bits wide; the counter is mutated in place instead of rebinding an int
+BISNP_TAG_MASK = 0xFFF
+_BISNP_TAG_COUNTER = array("H", [0])
 
+
+class CxlMemBISnpPacket(CxlMemS2MBISnpPacket):
     @staticmethod
     def get_tag():
-        old_tag = CxlMemBISnpPacket.tag
-        CxlMemBISnpPacket.tag += 1
-        CxlMemBISnpPacket.tag %= 4096
+        old_tag = _BISNP_TAG_COUNTER[0]
+        _BISNP_TAG_COUNTER[0] = (old_tag + 1) & BISNP_TAG_MASK
         return old_tag
 
     @staticmethod
@@ -1739,9 +1741,7 @@ class CxlMemBISnpPacket(CxlMemS2MBISnpPacket):
         addr: int, opcode: CXL_MEM_S2MBISNP_OPCODE, bi_id: int = 0, bi_tag: int = 0
     ) -> "CxlMemBISnpPacket":
         packet = CxlMemBISnpPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.S2M_BISNP
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.S2M_BISNP)
         packet.s2mbisnp_header.valid = 0b1
         packet.s2mbisnp_header.opcode = opcode
         packet.s2mbisnp_header.bi_tag = bi_tag
@@ -1763,9 +1763,7 @@ class CxlMemMemDataPacket(CxlMemS2MDRSPacket):
         ld_id: int = 0,
     ) -> "CxlMemMemDataPacket":
         packet = CxlMemMemDataPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.S2M_DRS
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.S2M_DRS)
         packet.s2mdrs_header.opcode = drs_opcode
         packet.s2mdrs_header.meta_field = meta_field
         packet.s2mdrs_header.meta_value = meta_value
@@ -1783,9 +1781,7 @@ class CxlMemCmpPacket(CxlMemS2MNDRPacket):
         ld_id: int = 0,
     ) -> "CxlMemCmpPacket":
         packet = CxlMemCmpPacket()
-        packet.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
-        packet.system_header.payload_length = len(packet)
-        packet.cxl_mem_header.msg_class = CXL_MEM_MSG_CLASS.S2M_NDR
+        packet._write_headers(PAYLOAD_TYPE.CXL_MEM, CXL_MEM_MSG_CLASS.S2M_NDR)
         packet.s2mndr_header.valid = 0b1
         packet.s2mndr_header.opcode = ndr_opcode
         packet.s2mndr_header.meta_field = meta_field
@@ -1880,8 +1876,7 @@ class CciMessageHeaderPacket(UnalignedBitStructure):
     message_category: int
     message_tag: int
     command_opcode: int
-    message_payload_length_low: int
-    message_payload_length_high: int
+    message_payload_length: int
     background_operation: int
     return_code: int
     vendor_specific_extended_status: int
@@ -1892,22 +1887,27 @@ class CciMessageHeaderPacket(UnalignedBitStructure):
         BitField("message_tag", 8, 15),
         BitField("reserved1", 16, 23),
         BitField("command_opcode", 24, 39),
-        BitField("message_payload_length_low", 40, 55),
-        BitField("message_payload_length_high", 56, 60),
+        BitField("message_payload_length", 40, 60),
         BitField("reserved2", 61, 62),
         BitField("background_operation", 63, 63),
         BitField("return_code", 64, 79),
         BitField("vendor_specific_extended_status", 80, 95),
     ]
 
+    @classmethod
+    def create_from_header(cls, header: "CciMessageHeaderPacket") -> "CciMessageHeaderPacket":
+        message_header = cls()
+        message_header.copy_bytes(0, header, cls.get_size())
+        return message_header
+
     def get_message_payload_length(self) -> int:
-        return self.message_payload_length_high << 16 | self.message_payload_length_low
+        return self.message_payload_length
 
     def set_message_payload_length(self, length):
-        payload_length_low = length & 0xFFFF
-        payload_length_high = (length >> 16) & 0x1F
-        self.message_payload_length_high = payload_length_high
-        self.message_payload_length_low = payload_length_low
+        self.message_payload_length = length
+
+
+CCI_MESSAGE_PAYLOAD_START = CciMessageHeaderPacket.get_size()
 
 
 class CciMessageBasePacket(UnalignedBitStructure):
@@ -1921,7 +1921,7 @@ class CciMessageBasePacket(UnalignedBitStructure):
             CciMessageHeaderPacket.get_size() - 1,
             CciMessageHeaderPacket,
         ),
-        DynamicByteField("_payload_data", CciMessageHeaderPacket.get_size(), 0x0),
+        DynamicByteField("_payload_data", CCI_MESSAGE_PAYLOAD_START, 0x0),
     ]
 
     def get_total_size(self) -> int:
@@ -1931,17 +1931,22 @@ class CciMessageBasePacket(UnalignedBitStructure):
         return self.header.get_message_payload_length()
 
     def get_payload(self) -> bytes:
-        return int.to_bytes(self._payload_data, self.get_payload_size(), "little")
+        return self.read_buffer(CCI_MESSAGE_PAYLOAD_START, self.get_payload_size())
 
 
 class CciMessagePacket(CciMessageBasePacket):
     @staticmethod
     def create(header: CciMessageHeaderPacket, data: bytes) -> "CciMessagePacket":
+        packet = CciMessagePacket.allocate(header, len(data))
+        packet.write_buffer(CCI_MESSAGE_PAYLOAD_START, data)
+        return packet
+
+    @staticmethod
+    def allocate(header: CciMessageHeaderPacket, payload_length: int) -> "CciMessagePacket":
+        # NOTE: The payload is left zeroed for the caller to fill in place
         packet = CciMessagePacket()
-        packet.set_dynamic_field_length(len(data))
+        packet.set_dynamic_field_length(payload_length)
         packet.header = header
-        # pylint: disable=protected-access
-        packet._payload_data = int.from_bytes(data, "little")
         return packet
 
 
@@ -1986,11 +1991,8 @@ class CciPayloadBasePacket(CciBasePacket):
 
 class CciPayloadPacket(CciPayloadBasePacket):
     def get_packet(self) -> CciMessagePacket:
-        # Go through setter, don't inline self.cci_msg
-        cci_msg = self.cci_msg
-        cci_len = self.get_payload_size()
         packet = CciMessagePacket()
-        packet.reset(int.to_bytes(cci_msg, cci_len, "little"))
+        packet.reset(self.read_buffer(CCI_FIELD_START, self.get_payload_size()))
         packet.set_dynamic_field_length(packet.get_payload_size())
         # We don't need this as it's not read directly from PacketReader
         # packet.system_header.payload_length = len(packet)
@@ -2008,20 +2010,60 @@ class CciPayloadPacket(CciPayloadBasePacket):
         packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
         packet.system_header.payload_length = len(packet)
 
+        # NOTE: Headers may have been replaced by separate structures (see
+        # CciMessagePacket.create), so each one is copied from its own buffer
         if isinstance(data, CciMessagePacket):
-            packet.cci_msg = int.from_bytes(bytes(data.header) + data.get_payload(), "little")
+            headers = (data.header,)
         else:
-            packet.cci_msg = int.from_bytes(
-                bytes(data.system_header)
-                + bytes(data.cci_header)
-                + data.cci_msg.to_bytes(data.get_payload_size(), "little"),
-                "little",
-            )
+            headers = (data.system_header, data.cci_header)
+        offset = CCI_FIELD_START
+        for header in headers:
+            offset += packet.copy_bytes(offset, header, len(header))
+        header_size = offset - CCI_FIELD_START
+        packet.copy_bytes(offset, data, data.get_payload_size(), header_size)
+        return packet
+
+
+class PooledCciPacket:
+    """
+    Freelist for fixed-size CCI packets. Each subclass gets its own bounded pool;
+    call release() once the packet has been written out and is no longer referenced.
+    """
+
+    _pool: deque
+    _POOL_SIZE = 1024
+    _in_pool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._pool = deque()
+
+    @classmethod
+    def acquire(cls, data: Optional[bytes] = None):
+        try:
+            packet = cls._pool.pop()
+        except IndexError:
+            packet = cls()
+            if data is None:
+                return packet
+        packet._in_pool = False
+        packet.reset(data)
         return packet
 
+    def release(self):
+        # NOTE: Releasing a packet that is already pooled is a no-op, so it can never
+        # be handed out to two owners
+        if self._in_pool:
+            return
+        pool = type(self)._pool
+        if len(pool) < self._POOL_SIZE:
+            self._in_pool = True
+            pool.append(self)
+
 
 CCI_HEADER_DATA_REQUEST_START = CCI_HEADER_END + 1
 CCI_HEADER_DATA_REQUEST_END = CCI_HEADER_DATA_REQUEST_START + CciMessageHeaderPacket.get_size() - 1
+CCI_REQUEST_PAYLOAD_START = CCI_HEADER_DATA_REQUEST_END + 1
 
 
 class CciRequestPacket(CciBasePacket):
@@ -2041,8 +2083,28 @@ class CciRequestPacket(CciBasePacket):
     def is_req(self) -> bool:
         return self.cci_header.msg_class == CCI_MSG_CLASS.REQ
 
+    @classmethod
+    def create_from_ccimessage(cls, ccimessage: CciMessagePacket) -> "CciRequestPacket":
+        packet = cls.acquire() if issubclass(cls, PooledCciPacket) else cls()
+
+        # NOTE: Both headers share the CciMessageHeaderPacket layout, copy it as one buffer
+        packet.header_data.copy_bytes(0, ccimessage.header, CciMessageHeaderPacket.get_size())
+        packet.copy_payload_from_ccimessage(ccimessage)
+
+        # Written last, since copying the payload may resize the packet
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.REQ)
+        return packet
+
+    def copy_payload_from_ccimessage(self, ccimessage: CciMessagePacket):
+        self.copy_bytes(
+            CCI_REQUEST_PAYLOAD_START,
+            ccimessage,
+            len(self) - CCI_REQUEST_PAYLOAD_START,
+            CCI_MESSAGE_PAYLOAD_START,
+        )
 
-class GetLdInfoRequestPacket(CciRequestPacket):
+
+class GetLdInfoRequestPacket(CciRequestPacket, PooledCciPacket):
     def is_req(self) -> bool:
         return self.cci_header.msg_class == CCI_MSG_CLASS.REQ
 
@@ -2051,43 +2113,42 @@ class GetLdInfoRequestPacket(CciRequestPacket):
 
     @staticmethod
     def create() -> "GetLdInfoRequestPacket":
-        packet = GetLdInfoRequestPacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
+        return GetLdInfoRequestPacket.acquire(GET_LD_INFO_REQUEST_TEMPLATE)
 
-        packet.header_data.message_category = 0
-        packet.header_data.message_tag = 0
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO
-        packet.header_data.message_payload_length_high = 0
-        packet.header_data.message_payload_length_low = 0
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
-
-        return packet
+    @staticmethod
+    def create_batch(message_tags: Iterable[int]) -> List[memoryview]:
+        """
+        Encodes one request per message tag into a single contiguous buffer and
+        returns a view of each request. The views' underlying object is the whole
+        batch, so it can be written to the stream in one call.
+        """
+        message_tags = bytes(message_tags)
+        size = len(GET_LD_INFO_REQUEST_TEMPLATE)
+        batch = bytearray(GET_LD_INFO_REQUEST_TEMPLATE * len(message_tags))
+        batch[GET_LD_INFO_REQUEST_TAG_OFFSET::size] = message_tags
+        view = memoryview(batch)
+        return [view[offset : offset + size] for offset in range(0, len(batch), size)]
 
     @staticmethod
-    def create_from_ccimessage(ccimessage: CciMessagePacket) -> "GetLdInfoRequestPacket":
+    def create_template() -> bytes:
         packet = GetLdInfoRequestPacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.REQ)
 
-        packet.header_data.message_category = ccimessage.header.message_category
-        packet.header_data.message_tag = ccimessage.header.message_tag
-        packet.header_data.command_opcode = ccimessage.header.command_opcode
-        packet.header_data.message_payload_length_high = (
-            ccimessage.header.message_payload_length_high
-        )
-        packet.header_data.message_payload_length_low = ccimessage.header.message_payload_length_low
-        packet.header_data.return_code = ccimessage.header.return_code
-        packet.header_data.vendor_specific_extended_status = (
-            ccimessage.header.vendor_specific_extended_status
-        )
-        packet.header_data.background_operation = ccimessage.header.background_operation
+        header_data = packet.header_data
+        header_data.message_category = 0
+        header_data.message_tag = 0
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO
+        header_data.message_payload_length = 0
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
+
+        return bytes(packet)
 
-        return packet
+
+# NOTE: GET_LD_INFO requests are all constant, so create() only copies this template
+GET_LD_INFO_REQUEST_TEMPLATE = GetLdInfoRequestPacket.create_template()
+GET_LD_INFO_REQUEST_TAG_OFFSET = CCI_HEADER_DATA_REQUEST_START + 1
 
 
 class GetLdAllocationsRequestPayload(UnalignedBitStructure):
@@ -2128,53 +2189,24 @@ class GetLdAllocationsRequestBasePacket(CciRequestPacket):
         return self.get_ld_allocations_request.ld_allocation_list_limit
 
 
-class GetLdAllocationsRequestPacket(GetLdAllocationsRequestBasePacket):
+class GetLdAllocationsRequestPacket(GetLdAllocationsRequestBasePacket, PooledCciPacket):
     @staticmethod
     def create(start_ld_id: int, ld_allocation_list_limit: int) -> "GetLdAllocationsRequestPacket":
-        packet = GetLdAllocationsRequestPacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
-
-        packet.header_data.message_category = 0
-        packet.header_data.message_tag = 0
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS
-        packet.header_data.message_payload_length_high = 0
-        packet.header_data.message_payload_length_low = 0
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
-
-        packet.get_ld_allocations_request.start_ld_id = start_ld_id
-        packet.get_ld_allocations_request.ld_allocation_list_limit = ld_allocation_list_limit
-
-        return packet
-
-    @staticmethod
-    def create_from_ccimessage(ccimessage: CciMessagePacket) -> "GetLdAllocationsRequestPacket":
-        packet = GetLdAllocationsRequestPacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
-
-        packet.header_data.message_category = ccimessage.header.message_category
-        packet.header_data.message_tag = ccimessage.header.message_tag
-        packet.header_data.command_opcode = ccimessage.header.command_opcode
-        packet.header_data.message_payload_length_high = (
-            ccimessage.header.message_payload_length_high
-        )
-        packet.header_data.message_payload_length_low = ccimessage.header.message_payload_length_low
-        packet.header_data.return_code = ccimessage.header.return_code
-        packet.header_data.vendor_specific_extended_status = (
-            ccimessage.header.vendor_specific_extended_status
-        )
-        packet.header_data.background_operation = ccimessage.header.background_operation
-
-        # pylint: disable=protected-access
-        packet.get_ld_allocations_request.start_ld_id = ccimessage._payload_data & 0xFF
-        packet.get_ld_allocations_request.ld_allocation_list_limit = (
-            ccimessage._payload_data >> 8
-        ) & 0xFF
+        packet = GetLdAllocationsRequestPacket.acquire()
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.REQ)
+
+        header_data = packet.header_data
+        header_data.message_category = 0
+        header_data.message_tag = 0
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS
+        header_data.message_payload_length = 0
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
+
+        payload = packet.get_ld_allocations_request
+        payload.start_ld_id = start_ld_id
+        payload.ld_allocation_list_limit = ld_allocation_list_limit
 
         return packet
 
@@ -2195,11 +2227,12 @@ SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_START = CCI_HEADER_DATA_REQUEST_END + 1
 SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_END = (
     SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_START + SetLdAllocationsRequestPayload.get_size() - 1
 )
+SET_LD_ALLOCATIONS_REQUEST_LIST_START = SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_END + 1
 
 
 class SetLdAllocationsRequestBasePacket(CciRequestPacket):
     set_ld_allocations_request_payload: SetLdAllocationsRequestPayload
-    ld_allocation_list: int
+    ld_allocation_list: int  # Use get_ld_allocation_list() for the wire bytes
 
     _fields = CciRequestPacket._fields + [
         StructureField(
@@ -2208,7 +2241,7 @@ class SetLdAllocationsRequestBasePacket(CciRequestPacket):
             SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_END,
             SetLdAllocationsRequestPayload,
         ),
-        DynamicByteField("ld_allocation_list", SET_LD_ALLOCATIONS_REQUEST_PAYLOAD_END + 1, 0x0),
+        DynamicByteField("ld_allocation_list", SET_LD_ALLOCATIONS_REQUEST_LIST_START, 0x0),
     ]
 
     def is_req(self) -> bool:
@@ -2221,81 +2254,54 @@ class SetLdAllocationsRequestBasePacket(CciRequestPacket):
         return self.set_ld_allocations_request_payload.start_ld_id
 
     def get_ld_allocation_list(self) -> bytes:
-        return int.to_bytes(
-            self.ld_allocation_list,
+        return self.read_buffer(
+            SET_LD_ALLOCATIONS_REQUEST_LIST_START,
             self.set_ld_allocations_request_payload.number_of_lds * 2 * 8,
-            "little",
         )
 
 
 class SetLdAllocationsRequestPacket(SetLdAllocationsRequestBasePacket):
-    @staticmethod
-    def create_from_ccimessage(ccimessage: CciMessagePacket) -> "SetLdAllocationsRequestPacket":
-        packet = SetLdAllocationsRequestPacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
-
-        packet.header_data.message_category = ccimessage.header.message_category
-        packet.header_data.message_tag = ccimessage.header.message_tag
-        packet.header_data.command_opcode = ccimessage.header.command_opcode
-        packet.header_data.message_payload_length_high = (
-            ccimessage.header.message_payload_length_high
+    def copy_payload_from_ccimessage(self, ccimessage: CciMessagePacket):
+        # Copies the fixed payload while the allocation list is still empty
+        super().copy_payload_from_ccimessage(ccimessage)
+
+        # NOTE: The allocation list is copied straight from the message buffer, without
+        # materializing the message payload as an int or bytes first
+        ld_allocation_list_length = self.get_number_of_lds() * 2 * 8
+        self.set_dynamic_field_length(ld_allocation_list_length)
+        self.copy_bytes(
+            SET_LD_ALLOCATIONS_REQUEST_LIST_START,
+            ccimessage,
+            ld_allocation_list_length,
+            CCI_MESSAGE_PAYLOAD_START + SetLdAllocationsRequestPayload.get_size(),
         )
-        packet.header_data.message_payload_length_low = ccimessage.header.message_payload_length_low
-        packet.header_data.return_code = ccimessage.header.return_code
-        packet.header_data.vendor_specific_extended_status = (
-            ccimessage.header.vendor_specific_extended_status
-        )
-        packet.header_data.background_operation = ccimessage.header.background_operation
-
-        cci_payload = ccimessage.get_payload()
-        packet.set_ld_allocations_request_payload.reset(
-            cci_payload[: SetLdAllocationsRequestPayload.get_size()]
-        )
-
-        ld_allocation_list = cci_payload[SetLdAllocationsRequestPayload.get_size() :]
-        ld_allocation_list = [
-            int.from_bytes(ld_allocation_list[i : i + 8], "little")
-            for i in range(0, len(ld_allocation_list), 8)
-        ]
-
-        packet.set_dynamic_field_length(
-            packet.set_ld_allocations_request_payload.number_of_lds * 2 * 8
-        )
-        packet.ld_allocation_list = ld_allocation_list
-        packet.system_header.payload_length = len(packet)
-
-        return packet
 
     @staticmethod
     def create(
-        number_of_lds: int, start_ld_id: int, ld_allocation_list: int
+        number_of_lds: int, start_ld_id: int, ld_allocation_list: bytes
     ) -> "SetLdAllocationsRequestPacket":
-        packet = SetLdAllocationsRequestPacket()
-
-        packet.cci_header.msg_class = CCI_MSG_CLASS.REQ
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-
-        packet.header_data.message_category = 0
-        packet.header_data.message_tag = 0
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.SET_LD_ALLOCATIONS
-        payload_length = 4 + 16 * number_of_lds
-        packet.header_data.message_payload_length_low = payload_length & 0xFFFF
-        packet.header_data.message_payload_length_high = (payload_length >> 16) & 0x1F
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
-
         if number_of_lds < 1:
             raise Exception("Number of LDs must be greater than 0")
-        packet.set_ld_allocations_request_payload.number_of_lds = number_of_lds
-        packet.set_ld_allocations_request_payload.start_ld_id = start_ld_id
-        packet.set_ld_allocations_request_payload.reserved = 0
+        packet = SetLdAllocationsRequestPacket()
+        # NOTE: Size the allocation list first so the headers carry the final length
         packet.set_dynamic_field_length(number_of_lds * 2 * 8)
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.REQ)
 
-        packet.ld_allocation_list = ld_allocation_list
-        packet.system_header.payload_length = len(packet)
+        header_data = packet.header_data
+        header_data.message_category = 0
+        header_data.message_tag = 0
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.SET_LD_ALLOCATIONS
+        header_data.message_payload_length = 4 + 16 * number_of_lds
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
+
+        payload = packet.set_ld_allocations_request_payload
+        payload.number_of_lds = number_of_lds
+        payload.start_ld_id = start_ld_id
+        payload.reserved = 0
+
+        packet.write_buffer(SET_LD_ALLOCATIONS_REQUEST_LIST_START, ld_allocation_list)
 
         return packet
 
@@ -2348,6 +2354,10 @@ class GetLdInfoResponsePayload(UnalignedBitStructure):
 
 GET_LD_INFO_RESPONSE_START = CCI_HEADER_DATA_RESPONSE_END + 1
 GET_LD_INFO_RESPONSE_END = GET_LD_INFO_RESPONSE_START + GetLdInfoResponsePayload.get_size() - 1
+GET_LD_INFO_RESPONSE_PAYLOAD_FORMATS = {
+    "little": struct.Struct("<QHB"),
+    "big": struct.Struct(">QHB"),
+}
 
 
 class GetLdInfoResponseBasePacket(CciResponsePacket):
@@ -2375,58 +2385,61 @@ class GetLdInfoResponseBasePacket(CciResponsePacket):
         return self.payload.get_size()
 
 
-class GetLdInfoResponsePacket(GetLdInfoResponseBasePacket):
+class GetLdInfoResponsePacket(GetLdInfoResponseBasePacket, PooledCciPacket):
     def payload_to_bytes(self, byteorder: str) -> bytes:
-        memory_size_bytes = self.payload.memory_size.to_bytes(8, byteorder)
-        ld_count_bytes = self.payload.ld_count.to_bytes(2, byteorder)
-        qos_telemetry_bytes = self.payload.QoS_Telemetry_capability.to_bytes(1, byteorder)
-
-        return memory_size_bytes + ld_count_bytes + qos_telemetry_bytes
+        payload = self.payload
+        return GET_LD_INFO_RESPONSE_PAYLOAD_FORMATS[byteorder].pack(
+            payload.memory_size, payload.ld_count, payload.QoS_Telemetry_capability
+        )
 
     def create_ccimessage(self) -> "CciMessagePacket":
-        cci_message__header = CciMessageHeaderPacket()
-        cci_message__header.message_category = self.header_data.message_category
-        cci_message__header.message_tag = self.header_data.message_tag
-        cci_message__header.command_opcode = self.header_data.command_opcode
-        cci_message__header.message_payload_length_high = (
-            self.header_data.message_payload_length_high
-        )
-        cci_message__header.message_payload_length_low = self.header_data.message_payload_length_low
-        cci_message__header.return_code = self.header_data.return_code
-        cci_message__header.vendor_specific_extended_status = (
-            self.header_data.vendor_specific_extended_status
-        )
-        cci_message__header.background_operation = self.header_data.background_operation
+        cci_message__header = CciMessageHeaderPacket.create_from_header(self.header_data)
         # payload size is 11bytes, and this
-
-        cci_message_packet = CciMessagePacket.create(
-            cci_message__header, self.payload_to_bytes("little")
+        payload_format = GET_LD_INFO_RESPONSE_PAYLOAD_FORMATS["little"]
+        payload = self.payload
+
+        cci_message_packet = CciMessagePacket.allocate(cci_message__header, payload_format.size)
+        cci_message_packet.pack_into(
+            payload_format,
+            CCI_MESSAGE_PAYLOAD_START,
+            payload.memory_size,
+            payload.ld_count,
+            payload.QoS_Telemetry_capability,
         )
 
         return cci_message_packet
 
     @staticmethod
     def create(memory_size: int, ld_count: int, message_tag: int) -> "GetLdInfoResponsePacket":
+        packet = GetLdInfoResponsePacket.acquire(GET_LD_INFO_RESPONSE_TEMPLATE)
+        packet.header_data.message_tag = message_tag
+        payload = packet.payload
+        payload.memory_size = memory_size
+        payload.ld_count = ld_count
+        return packet
+
+    @staticmethod
+    def create_template() -> bytes:
         packet = GetLdInfoResponsePacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.RSP
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-        packet.system_header.payload_length = len(packet)
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.RSP)
 
-        packet.header_data.message_category = 1
-        packet.header_data.message_tag = message_tag
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO
+        header_data = packet.header_data
+        header_data.message_category = 1
+        header_data.message_tag = 0
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO
         # get ld info payload size is 11 bytes
-        packet.header_data.message_payload_length_high = 0
-        packet.header_data.message_payload_length_low = 11
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
-
-        packet.payload.memory_size = memory_size
-        packet.payload.ld_count = ld_count
+        header_data.message_payload_length = 11
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
+
         packet.payload.QoS_Telemetry_capability = 0
 
-        return packet
+        return bytes(packet)
+
+
+# NOTE: Only message_tag, memory_size and ld_count vary between GET_LD_INFO responses
+GET_LD_INFO_RESPONSE_TEMPLATE = GetLdInfoResponsePacket.create_template()
 
 
 class GetLdAllocationsResponsePayload(UnalignedBitStructure):
@@ -2447,11 +2460,16 @@ GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_START = CCI_HEADER_DATA_RESPONSE_END + 1
 GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END = (
     GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_START + GetLdAllocationsResponsePayload.get_size() - 1
 )
+GET_LD_ALLOCATIONS_RESPONSE_LIST_START = GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END + 1
+GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMATS = {
+    "little": struct.Struct("<BBBB"),
+    "big": struct.Struct(">BBBB"),
+}
 
 
 class GetLdAllocationsResponseBasePacket(CciResponsePacket):
     get_ld_allocations_response_payload: GetLdAllocationsResponsePayload
-    ld_allocation_list: int
+    ld_allocation_list: int  # Use get_ld_allocation_list() for the wire bytes
 
     _fields = CciResponsePacket._fields + [
         StructureField(
@@ -2460,7 +2478,7 @@ class GetLdAllocationsResponseBasePacket(CciResponsePacket):
             GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END,
             GetLdAllocationsResponsePayload,
         ),
-        DynamicByteField("ld_allocation_list", GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END + 1, 0x0),
+        DynamicByteField("ld_allocation_list", GET_LD_ALLOCATIONS_RESPONSE_LIST_START, 0x0),
     ]
 
     def get_number_of_lds(self) -> int:
@@ -2470,10 +2488,9 @@ class GetLdAllocationsResponseBasePacket(CciResponsePacket):
         return self.get_ld_allocations_response_payload.memory_granularity
 
     def get_ld_allocation_list(self) -> bytes:
-        return int.to_bytes(
-            self.ld_allocation_list,
+        return self.read_buffer(
+            GET_LD_ALLOCATIONS_RESPONSE_LIST_START,
             self.get_ld_allocations_response_payload.ld_allocation_list_length * 2 * 8,
-            "little",
         )
 
     def get_start_ld_id(self) -> int:
@@ -2485,47 +2502,36 @@ class GetLdAllocationsResponseBasePacket(CciResponsePacket):
 
 class GetLdAllocationsResponsePacket(GetLdAllocationsResponseBasePacket):
     def payload_to_bytes(self, byteorder: str) -> bytes:
-        number_of_lds_bytes = self.get_ld_allocations_response_payload.number_of_lds.to_bytes(
-            1, byteorder
-        )
-        memory_granularity_bytes = (
-            self.get_ld_allocations_response_payload.memory_granularity.to_bytes(1, byteorder)
-        )
-        start_ld_id_bytes = self.get_ld_allocations_response_payload.start_ld_id.to_bytes(
-            1, byteorder
-        )
-        ld_allocation_list_length_bytes = (
-            self.get_ld_allocations_response_payload.ld_allocation_list_length.to_bytes(
-                1, byteorder
-            )
-        )
-        ld_allocations_bytes = self.get_ld_allocation_list()
-
+        payload = self.get_ld_allocations_response_payload
         return (
-            number_of_lds_bytes
-            + memory_granularity_bytes
-            + start_ld_id_bytes
-            + ld_allocation_list_length_bytes
-            + ld_allocations_bytes
+            GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMATS[byteorder].pack(
+                payload.number_of_lds,
+                payload.memory_granularity,
+                payload.start_ld_id,
+                payload.ld_allocation_list_length,
+            )
+            + self.get_ld_allocation_list()
         )
 
     def create_ccimessage(self) -> "CciMessagePacket":
-        cci_message__header = CciMessageHeaderPacket()
-        cci_message__header.message_category = self.header_data.message_category
-        cci_message__header.message_tag = self.header_data.message_tag
-        cci_message__header.command_opcode = self.header_data.command_opcode
-        cci_message__header.message_payload_length_high = (
-            self.header_data.message_payload_length_high
+        cci_message__header = CciMessageHeaderPacket.create_from_header(self.header_data)
+        payload_format = GET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMATS["little"]
+        payload = self.get_ld_allocations_response_payload
+        ld_allocation_list = self.get_ld_allocation_list()
+
+        cci_message_packet = CciMessagePacket.allocate(
+            cci_message__header, payload_format.size + len(ld_allocation_list)
         )
-        cci_message__header.message_payload_length_low = self.header_data.message_payload_length_low
-        cci_message__header.return_code = self.header_data.return_code
-        cci_message__header.vendor_specific_extended_status = (
-            self.header_data.vendor_specific_extended_status
+        cci_message_packet.pack_into(
+            payload_format,
+            CCI_MESSAGE_PAYLOAD_START,
+            payload.number_of_lds,
+            payload.memory_granularity,
+            payload.start_ld_id,
+            payload.ld_allocation_list_length,
         )
-        cci_message__header.background_operation = self.header_data.background_operation
-
-        cci_message_packet = CciMessagePacket.create(
-            cci_message__header, self.payload_to_bytes("little")
+        cci_message_packet.write_buffer(
+            CCI_MESSAGE_PAYLOAD_START + payload_format.size, ld_allocation_list
         )
 
         return cci_message_packet
@@ -2536,33 +2542,29 @@ class GetLdAllocationsResponsePacket(GetLdAllocationsResponseBasePacket):
         memory_granularity: int,
         start_ld_id: int,
         ld_allocation_list_length: int,
-        ld_allocation_list: int,
+        ld_allocation_list: bytes,
         message_tag: int,
     ) -> "GetLdAllocationsResponsePacket":
         packet = GetLdAllocationsResponsePacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.RSP
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
+        packet.set_dynamic_field_length(ld_allocation_list_length * 2 * 8)
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.RSP)
 
-        packet.header_data.message_category = 1
-        packet.header_data.message_tag = message_tag
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS
-        payload_length = 4 + ld_allocation_list_length * 16
-        packet.header_data.message_payload_length_low = payload_length & 0xFFFF
-        packet.header_data.message_payload_length_high = (payload_length >> 16) & 0x1F
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
+        header_data = packet.header_data
+        header_data.message_category = 1
+        header_data.message_tag = message_tag
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS
+        header_data.message_payload_length = 4 + ld_allocation_list_length * 16
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
 
         # Set payload_packet
-        packet.get_ld_allocations_response_payload.number_of_lds = number_of_lds
-        packet.get_ld_allocations_response_payload.memory_granularity = memory_granularity
-        packet.get_ld_allocations_response_payload.start_ld_id = start_ld_id
-        packet.get_ld_allocations_response_payload.ld_allocation_list_length = (
-            ld_allocation_list_length
-        )
-        packet.set_dynamic_field_length(ld_allocation_list_length * 2 * 8)
-        packet.ld_allocation_list = ld_allocation_list
-        packet.system_header.payload_length = len(packet)
+        payload = packet.get_ld_allocations_response_payload
+        payload.number_of_lds = number_of_lds
+        payload.memory_granularity = memory_granularity
+        payload.start_ld_id = start_ld_id
+        payload.ld_allocation_list_length = ld_allocation_list_length
+        packet.write_buffer(GET_LD_ALLOCATIONS_RESPONSE_LIST_START, ld_allocation_list)
 
         return packet
 
@@ -2583,11 +2585,13 @@ SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_START = CCI_HEADER_DATA_RESPONSE_END + 1
 SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END = (
     SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_START + SetLdAllocationsResponsePayload.get_size() - 1
 )
+SET_LD_ALLOCATIONS_RESPONSE_LIST_START = SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END + 1
+SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMAT = struct.Struct("<BBH")
 
 
 class SetLdAllocationsResponseBasePacket(CciResponsePacket):
     set_ld_allocations_response_payload: SetLdAllocationsResponsePayload
-    ld_allocation_list: int
+    ld_allocation_list: int  # Use get_ld_allocation_list() for the wire bytes
 
     _fields = CciResponsePacket._fields + [
         StructureField(
@@ -2596,7 +2600,7 @@ class SetLdAllocationsResponseBasePacket(CciResponsePacket):
             SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END,
             SetLdAllocationsResponsePayload,
         ),
-        DynamicByteField("ld_allocation_list", SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_END + 1, 0x0),
+        DynamicByteField("ld_allocation_list", SET_LD_ALLOCATIONS_RESPONSE_LIST_START, 0x0),
     ]
 
     def get_number_of_lds(self) -> int:
@@ -2606,71 +2610,69 @@ class SetLdAllocationsResponseBasePacket(CciResponsePacket):
         return self.set_ld_allocations_response_payload.start_ld_id
 
     def get_ld_allocation_list_length(self) -> int:
-        return self.ld_allocation_list
+        return self.set_ld_allocations_response_payload.number_of_lds
 
     def get_ld_allocation_list(self) -> bytes:
-        return int.to_bytes(
-            self.ld_allocation_list,
+        return self.read_buffer(
+            SET_LD_ALLOCATIONS_RESPONSE_LIST_START,
             self.set_ld_allocations_response_payload.number_of_lds * 2 * 8,
-            "little",
         )
 
 
 class SetLdAllocationsResponsePacket(SetLdAllocationsResponseBasePacket):
     def payload_to_bytes(self) -> bytes:
-        number_of_lds_bytes = self.set_ld_allocations_response_payload.number_of_lds.to_bytes(
-            1, "little"
-        )
-        start_ld_id_bytes = self.set_ld_allocations_response_payload.start_ld_id.to_bytes(
-            1, "little"
+        payload = self.set_ld_allocations_response_payload
+        return (
+            SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMAT.pack(
+                payload.number_of_lds, payload.start_ld_id, payload.reserved
+            )
+            + self.get_ld_allocation_list()
         )
-        reserved_bytes = self.set_ld_allocations_response_payload.reserved.to_bytes(2, "little")
-
-        return number_of_lds_bytes + start_ld_id_bytes + reserved_bytes + self.ld_allocation_list
 
     def create_ccimessage(self) -> "CciMessagePacket":
-        cci_message_header = CciMessageHeaderPacket()
-        cci_message_header.message_category = self.header_data.message_category
-        cci_message_header.message_tag = self.header_data.message_tag
-        cci_message_header.command_opcode = self.header_data.command_opcode
-        cci_message_header.message_payload_length_high = (
-            self.header_data.message_payload_length_high
+        cci_message_header = CciMessageHeaderPacket.create_from_header(self.header_data)
+        payload_format = SET_LD_ALLOCATIONS_RESPONSE_PAYLOAD_FORMAT
+        payload = self.set_ld_allocations_response_payload
+        ld_allocation_list = self.get_ld_allocation_list()
+
+        cci_message_packet = CciMessagePacket.allocate(
+            cci_message_header, payload_format.size + len(ld_allocation_list)
         )
-        cci_message_header.message_payload_length_low = self.header_data.message_payload_length_low
-        cci_message_header.return_code = self.header_data.return_code
-        cci_message_header.vendor_specific_extended_status = (
-            self.header_data.vendor_specific_extended_status
+        cci_message_packet.pack_into(
+            payload_format,
+            CCI_MESSAGE_PAYLOAD_START,
+            payload.number_of_lds,
+            payload.start_ld_id,
+            payload.reserved,
+        )
+        cci_message_packet.write_buffer(
+            CCI_MESSAGE_PAYLOAD_START + payload_format.size, ld_allocation_list
         )
-        cci_message_header.background_operation = self.header_data.background_operation
-
-        cci_message_packet = CciMessagePacket.create(cci_message_header, self.payload_to_bytes())
 
         return cci_message_packet
 
     @staticmethod
     def create(
-        number_of_lds: int, start_ld_id: int, ld_allocation_list: int, message_tag: int
+        number_of_lds: int, start_ld_id: int, ld_allocation_list: bytes, message_tag: int
     ) -> "SetLdAllocationsResponsePacket":
         packet = SetLdAllocationsResponsePacket()
-        packet.cci_header.msg_class = CCI_MSG_CLASS.RSP
-        packet.system_header.payload_type = PAYLOAD_TYPE.CCI_MCTP
-
-        packet.header_data.message_category = 1
-        packet.header_data.message_tag = message_tag
-        packet.header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.SET_LD_ALLOCATIONS
-        payload_length = 4 + 16 * number_of_lds
-        packet.header_data.message_payload_length_low = payload_length & 0xFFFF
-        packet.header_data.message_payload_length_high = (payload_length >> 16) & 0x1F
-        packet.header_data.return_code = 0
-        packet.header_data.vendor_specific_extended_status = 0
-        packet.header_data.background_operation = 0
-
-        packet.set_ld_allocations_response_payload.number_of_lds = number_of_lds
-        packet.set_ld_allocations_response_payload.start_ld_id = start_ld_id
-        packet.set_ld_allocations_response_payload.reserved = 0
-
         packet.set_dynamic_field_length(number_of_lds * 2 * 8)
-        packet.ld_allocation_list = ld_allocation_list
-        packet.system_header.payload_length = len(packet)
+        packet._write_headers(PAYLOAD_TYPE.CCI_MCTP, CCI_MSG_CLASS.RSP)
+
+        header_data = packet.header_data
+        header_data.message_category = 1
+        header_data.message_tag = message_tag
+        header_data.command_opcode = CCI_FM_API_COMMAND_OPCODE.SET_LD_ALLOCATIONS
+        header_data.message_payload_length = 4 + 16 * number_of_lds
+        header_data.return_code = 0
+        header_data.vendor_specific_extended_status = 0
+        header_data.background_operation = 0
+
+        payload = packet.set_ld_allocations_response_payload
+        payload.number_of_lds = number_of_lds
+        payload.start_ld_id = start_ld_id
+        payload.reserved = 0
+
+        packet.write_buffer(SET_LD_ALLOCATIONS_RESPONSE_LIST_START, ld_allocation_list)
 
         return packet
@@ -6,17 +6,20 @@
 """
 
 from typing import (
+    Callable,
     List,
     Dict,
     Type,
     Union,
     Optional,
+    Tuple,
     cast,
     TypedDict,
 )
 from dataclasses import dataclass, field
 from enum import Enum, auto
 import inspect
+import struct
 
 from opencis.util.logger import logger
 
@@ -126,6 +129,18 @@ class StructureField:
 DataField = Union[BitField, ByteField, DynamicByteField, StructureField]
 BITS_IN_BYTE = 8
 
+# Precompiled little-endian integer formats shared by every field access
+_INT_FORMATS = {
+    1: struct.Struct("<B"),
+    2: struct.Struct("<H"),
+    4: struct.Struct("<I"),
+    8: struct.Struct("<Q"),
+}
+_WORD_FORMAT = _INT_FORMATS[8]
+_WORD_SIZE = _WORD_FORMAT.size
+_UNPACK_WORD_FROM = _WORD_FORMAT.unpack_from
+_PACK_WORD_INTO = _WORD_FORMAT.pack_into
+
 
 @dataclass
 class BitMaskEntry:
@@ -134,6 +149,20 @@ class BitMaskEntry:
     offset: int = 0
 
 
+# (byte offset, byte length, bit shift, value mask) of a bit field
+BitLayout = Tuple[int, int, int, int]
+
+
+# Whether a structure class' constructor takes an "options" parameter, inspected once per class
+_STRUCTURE_TAKES_OPTIONS: Dict[type, bool] = {}
+
+
+def get_bit_layout(offset: int, width: int) -> BitLayout:
+    byte_offset = offset // BITS_IN_BYTE
+    length = (offset + width - 1) // BITS_IN_BYTE - byte_offset + 1
+    return (byte_offset, length, offset % BITS_IN_BYTE, (1 << width) - 1)
+
+
 class ShareableByteArray:
     _data: bytearray
 
@@ -218,15 +247,72 @@ class ShareableByteArray:
         # NOTE: Assume little-endian byte order
         length = end_offset - start_offset + 1
         start = start_offset + self.offset
-        end = end_offset + self.offset
+        fmt = _INT_FORMATS.get(length)
+        if fmt is not None and start + length <= len(self._data):
+            fmt.pack_into(self._data, start, value)
+            return
         val_bytes = value.to_bytes(length, "little")
-        self._data[start : end + 1] = val_bytes
+        self._data[start : start + length] = val_bytes
 
     def read_bytes(self, start_offset: int, end_offset: int) -> int:
         # NOTE: Assume little-endian byte order
+        length = end_offset - start_offset + 1
         start = start_offset + self.offset
-        end = end_offset + self.offset
-        return int.from_bytes(self._data[start : end + 1], "little")
+        fmt = _INT_FORMATS.get(length)
+        if fmt is not None and start + length <= len(self._data):
+            return fmt.unpack_from(self._data, start)[0]
+        return int.from_bytes(self._data[start : start + length], "little")
+
+    def unpack_from(self, fmt: struct.Struct, offset: int = 0) -> tuple:
+        # NOTE: Reads fmt.size bytes straight from the backing buffer
+        return fmt.unpack_from(self._data, self.offset + offset)
+
+    def write_buffer(self, offset: int, data: Union[bytes, bytearray, memoryview]) -> int:
+        # NOTE: Raw byte copy clamped to this buffer; short data leaves the rest untouched
+        length = max(0, min(len(data), self.size - offset))
+        start = self.offset + offset
+        self._data[start : start + length] = data[:length]
+        return length
+
+    def read_buffer(self, offset: int, length: int) -> bytes:
+        start = self.offset + offset
+        return bytes(self._data[start : start + max(0, min(length, self.size - offset))])
+
+    def copy_bytes_from(
+        self, offset: int, source: "ShareableByteArray", length: int, source_offset: int = 0
+    ) -> int:
+        # NOTE: Copies raw bytes between buffers without an intermediate bytes/int,
+        # clamped so the destination never grows or shrinks
+        length = max(0, min(length, self.size - offset, source.size - source_offset))
+        start = self.offset + offset
+        source_start = source.offset + source_offset
+        with memoryview(source._data) as view:
+            self._data[start : start + length] = view[source_start : source_start + length]
+        return length
+
+    def pack_into(self, fmt: struct.Struct, offset: int, *values):
+        fmt.pack_into(self._data, self.offset + offset, *values)
+
+    def _read_word(self, start: int, length: int) -> int:
+        if length <= _WORD_SIZE and start + _WORD_SIZE <= len(self._data):
+            return _UNPACK_WORD_FROM(self._data, start)[0]
+        return int.from_bytes(self._data[start : start + length], "little")
+
+    def _write_word(self, start: int, length: int, word: int):
+        if length <= _WORD_SIZE and start + _WORD_SIZE <= len(self._data):
+            _PACK_WORD_INTO(self._data, start, word)
+            return
+        self._data[start : start + length] = word.to_bytes(length, "little")
+
+    def read_bit_layout(self, layout: BitLayout) -> int:
+        byte_offset, length, shift, mask = layout
+        return (self._read_word(self.offset + byte_offset, length) >> shift) & mask
+
+    def write_bit_layout(self, layout: BitLayout, value: int):
+        byte_offset, length, shift, mask = layout
+        start = self.offset + byte_offset
+        word = self._read_word(start, length)
+        self._write_word(start, length, (word & ~(mask << shift)) | ((value & mask) << shift))
 
     def write_bits(self, offset, width, value):
         """
@@ -234,63 +320,27 @@ class ShareableByteArray:
         and spanning the specified bit width, allowing for unaligned writes.
         """
 
-        byte_offset = offset // 8
-        bit_offset = offset % 8
-        end_offset = offset + width - 1
-        byte_end_offset = end_offset // 8
-        bit_end_offset = end_offset % 8
-
-        # Handle the case where the write fits entirely within a single byte
-        if byte_offset == byte_end_offset:
-            mask = ((1 << width) - 1) << bit_offset
-            self[byte_offset] &= ~mask
-            self[byte_offset] |= (value << bit_offset) & mask
-            return
-
-        # Handle the case where the write spans multiple bytes
-        mask1 = ((1 << (8 - bit_offset)) - 1) << bit_offset
-        mask2 = (1 << (bit_end_offset + 1)) - 1
+        byte_offset = offset // BITS_IN_BYTE
+        bit_offset = offset % BITS_IN_BYTE
+        length = (offset + width - 1) // BITS_IN_BYTE - byte_offset + 1
+        start = self.offset + byte_offset
 
-        self[byte_offset] &= ~mask1
-        self[byte_offset] |= (value << bit_offset) & mask1
-        value = value >> (8 - bit_offset)
-
-        for i in range(byte_offset + 1, byte_end_offset):
-            self[i] = value & 0xFF
-            value = value >> 8
-
-        self[byte_end_offset] &= ~mask2
-        self[byte_end_offset] |= value & mask2
+        # Read-modify-write every byte touched by the field as one little-endian word
+        mask = ((1 << width) - 1) << bit_offset
+        word = self._read_word(start, length)
+        word = (word & ~mask) | ((value << bit_offset) & mask)
+        self._write_word(start, length, word)
 
     def read_bits(self, offset, width):
         """
         Reads a value from the byte array starting at the specified bit offset
         and spanning the specified bit width, allowing for unaligned reads.
         """
-        byte_offset = offset // 8
-        bit_offset = offset % 8
-        end_offset = offset + width - 1
-        byte_end_offset = end_offset // 8
-        bit_end_offset = end_offset % 8
-
-        # Handle the case where the read fits entirely within a single byte
-        if byte_offset == byte_end_offset:
-            mask = ((1 << width) - 1) << bit_offset
-            return (self[byte_offset] & mask) >> bit_offset
-
-        # Handle the case where the read spans multiple bytes
-        mask1 = ((1 << (BITS_IN_BYTE - bit_offset)) - 1) << bit_offset
-        mask2 = (1 << (bit_end_offset + 1)) - 1
-
-        result = self[byte_end_offset] & mask2
-
-        for i in range(byte_end_offset - 1, byte_offset, -1):
-            result = result << BITS_IN_BYTE
-            result |= self[i]
-
-        result = result << (BITS_IN_BYTE - bit_offset)
-        result |= (self[byte_offset] & mask1) >> bit_offset
-        return result
+        byte_offset = offset // BITS_IN_BYTE
+        bit_offset = offset % BITS_IN_BYTE
+        length = (offset + width - 1) // BITS_IN_BYTE - byte_offset + 1
+        word = self._read_word(self.offset + byte_offset, length)
+        return (word >> bit_offset) & ((1 << width) - 1)
 
     def copy_from(self, data: "ShareableByteArray", dest_offset: int = 0):
         for byte in bytes(data):
@@ -357,6 +407,15 @@ class UnalignedBitStructure:
                 self._add_structured_field(f)
 
     def _check_if_fields_are_valid(self):
+        # NOTE: Layouts declared on the class are validated once per class; instances
+        # that build their own _fields are always validated
+        class_layout = "_fields" not in self.__dict__
+        if class_layout:
+            layout = type(self).__dict__.get("_validated_layout")
+            if layout is not None and layout[0] is self._fields:
+                _, self._has_bit_fields, self._last_offset = layout
+                return
+
         fields = self._fields
         bit_fields = 0
         byte_fields = 0
@@ -425,6 +484,9 @@ class UnalignedBitStructure:
         else:
             self._last_offset = last_offset
 
+        if class_layout:
+            type(self)._validated_layout = (fields, self._has_bit_fields, self._last_offset)
+
     @staticmethod
     def ascii_str_to_int(ascii_str: str, length: int) -> int:
         ascii_bytes = ascii_str.encode("ascii")
@@ -473,37 +535,45 @@ class UnalignedBitStructure:
             raise Exception(f"field {name} has been already added")
         self._field_names.append(name)
 
+    def _install_field_property(self, field: DataField, make_property: Callable[[], property]):
+        # NOTE: Accessors of class-level fields are built once per class and reused by
+        # every instance; layouts built per instance get a fresh accessor each time
+        cls = self.__class__
+        if "_fields" in self.__dict__:
+            setattr(cls, field.name, make_property())
+            return
+
+        properties = cls.__dict__.get("_field_properties")
+        if properties is None:
+            properties = {}
+            cls._field_properties = properties
+        prop = properties.get(id(field))
+        if prop is None:
+            prop = make_property()
+            properties[id(field)] = prop
+        if cls.__dict__.get(field.name) is not prop:
+            setattr(cls, field.name, prop)
+
     def _add_bit_field(self, field: BitField):
-        width = field.end - field.start + 1
         self._add_field_name(field.name)
+        layout = get_bit_layout(field.start, field.end - field.start + 1)
 
-        def make_setter(start, width):
+        def make_property():
             def setter(self, value: int):
-                self._data.write_bits(start, width, value)
-
-            return setter
+                self._data.write_bit_layout(layout, value)
 
-        def make_getter(start, width):
             def getter(self) -> int:
-                return self._data.read_bits(start, width)
+                return self._data.read_bit_layout(layout)
 
-            return getter
+            return property(getter, setter)
 
         if field.default > 0 and self._verbose:
             logger.debug(
                 f"[Structure] {self._class_name}: Default {field.name} = {field.default:x}"
             )
 
-        self._data.write_bits(field.start, width, field.default)
-
-        setattr(
-            self.__class__,
-            field.name,
-            property(
-                make_getter(field.start, width),
-                make_setter(field.start, width),
-            ),
-        )
+        self._data.write_bit_layout(layout, field.default)
+        self._install_field_property(field, make_property)
 
     def _add_byte_field(self: "UnalignedBitStructure", field: ByteField):
         self._add_field_name(field.name)
@@ -525,10 +595,11 @@ class UnalignedBitStructure:
         if field.default > 0:
             self._data.write_bytes(field.start, field.end, field.default)
 
-        setattr(
-            self.__class__,
-            field.name,
-            property(make_getter(field.start, field.end), make_setter(field.start, field.end)),
+        self._install_field_property(
+            field,
+            lambda: property(
+                make_getter(field.start, field.end), make_setter(field.start, field.end)
+            ),
         )
 
     def _add_dynamic_byte_field(self: "UnalignedBitStructure", field: DynamicByteFieldInstance):
@@ -573,7 +644,11 @@ class UnalignedBitStructure:
         if self._verbose:
             logger.debug(f"[Structure] Creating structure {name}, offset= 0x{offset:x}")
         if field.options:
-            if "options" not in inspect.signature(field.structure).parameters:
+            takes_options = _STRUCTURE_TAKES_OPTIONS.get(field.structure)
+            if takes_options is None:
+                takes_options = "options" in inspect.signature(field.structure).parameters
+                _STRUCTURE_TAKES_OPTIONS[field.structure] = takes_options
+            if not takes_options:
                 raise Exception(
                     f'The constructor of structure "{name}" did not define "options" parameter'
                 )
@@ -592,6 +667,24 @@ class UnalignedBitStructure:
     def read_bytes(self, start_offset: int, end_offset: int) -> int:
         return self._data.read_bytes(start_offset, end_offset)
 
+    def write_buffer(self, start_offset: int, data: Union[bytes, bytearray, memoryview]) -> int:
+        return self._data.write_buffer(start_offset, data)
+
+    def read_buffer(self, start_offset: int, length: int) -> bytes:
+        return self._data.read_buffer(start_offset, length)
+
+    def pack_into(self, fmt: struct.Struct, start_offset: int, *values):
+        self._data.pack_into(fmt, start_offset, *values)
+
+    def copy_bytes(
+        self,
+        start_offset: int,
+        source: "UnalignedBitStructure",
+        length: int,
+        source_offset: int = 0,
+    ) -> int:
+        return self._data.copy_bytes_from(start_offset, source._data, length, source_offset)
+
     def _write_bits(self, offset: int, width: int, value: int):
         self._data.write_bits(offset, width, value)
 
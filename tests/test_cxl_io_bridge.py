@@ -0,0 +1,180 @@
+"""
+ Copyright (c) 2024, Eeum, Inc.
+
+ This software is licensed under the terms of the Revised BSD License.
+ See LICENSE for details.
+"""
+
+import asyncio
+import pytest
+
+from opencis.cxl.component.root_complex import io_bridge
+from opencis.cxl.component.root_complex.io_bridge import IoBridge, IoBridgeConfig, MMIO_TAG_COUNT
+from opencis.cxl.transport.memory_fifo import MemoryFifoPair
+from opencis.cxl.transport.transaction import (
+    CxlIoBasePacket,
+    CxlIoCompletionWithDataPacket,
+    CxlIoMemRdPacket,
+    CxlIoMemWrPacket,
+)
+from opencis.pci.component.fifo_pair import FifoPair
+
+# pylint: disable=protected-access, redefined-outer-name
+
+
+@pytest.fixture
+def bridge():
+    config = IoBridgeConfig(
+        root_bus=0,
+        cxl_io_cfg_fifos=FifoPair(),
+        cxl_io_mmio_fifos=FifoPair(),
+        memory_producer_fifos=MemoryFifoPair(),
+        host_name="MyHost",
+    )
+    return IoBridge(config)
+
+
+async def get_read_requests(bridge: IoBridge, count: int):
+    requests = []
+    for _ in range(count):
+        packet = await bridge._cxl_io_mmio_fifos.host_to_target.get()
+        assert isinstance(packet, CxlIoMemRdPacket)
+        requests.append(packet)
+    return requests
+
+
+async def send_completion(bridge: IoBridge, tag: int, data: int):
+    packet = CxlIoCompletionWithDataPacket.create(req_id=0, tag=tag, data=data)
+    await bridge._cxl_io_mmio_fifos.target_to_host.put(packet)
+
+
+async def stop_processing(bridge: IoBridge, task: asyncio.Task):
+    await bridge._cxl_io_mmio_fifos.target_to_host.put(None)
+    await task
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_write_batch(bridge: IoBridge):
+    writes = [(0x1000, 8, 0x11), (0x1008, 8, 0x22), (0x1010, 8, 0x33)]
+    await bridge.write_mmio_batch(writes)
+
+    for address, _, value in writes:
+        packet = bridge._cxl_io_mmio_fifos.host_to_target.get_nowait()
+        assert isinstance(packet, CxlIoMemWrPacket)
+        assert packet.get_address() == address
+        assert packet.data == value
+    assert bridge._cxl_io_mmio_fifos.host_to_target.empty()
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_batch(bridge: IoBridge):
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    addresses = [0x1000, 0x1008, 0x1010]
+    reads = asyncio.create_task(bridge.read_mmio_batch((addr, 8) for addr in addresses))
+
+    requests = await get_read_requests(bridge, len(addresses))
+    assert [request.get_address() for request in requests] == addresses
+    for request in requests:
+        await send_completion(bridge, request.mreq_header.tag, request.get_address() + 1)
+
+    assert await reads == [addr + 1 for addr in addresses]
+    await stop_processing(bridge, processor)
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_batch_out_of_order(bridge: IoBridge):
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    addresses = [0x1000, 0x1008, 0x1010, 0x1018]
+    reads = asyncio.create_task(bridge.read_mmio_batch((addr, 8) for addr in addresses))
+
+    requests = await get_read_requests(bridge, len(addresses))
+    assert len(bridge._mmio_reads) == len(addresses)
+    for request in reversed(requests):
+        await send_completion(bridge, request.mreq_header.tag, request.get_address() + 1)
+
+    assert await reads == [addr + 1 for addr in addresses]
+    assert not bridge._mmio_reads
+    await stop_processing(bridge, processor)
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_batch_larger_than_tag_space(bridge: IoBridge):
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    addresses = [0x1000 + i * 8 for i in range(MMIO_TAG_COUNT + 44)]
+    reads = asyncio.create_task(bridge.read_mmio_batch((addr, 8) for addr in addresses))
+
+    # NOTE: Only one tag space worth of reads is issued until those have completed
+    first = await get_read_requests(bridge, MMIO_TAG_COUNT)
+    await asyncio.sleep(0)
+    assert bridge._cxl_io_mmio_fifos.host_to_target.empty()
+    assert len({request.mreq_header.tag for request in first}) == MMIO_TAG_COUNT
+    for request in first:
+        await send_completion(bridge, request.mreq_header.tag, request.get_address() + 1)
+
+    rest = await get_read_requests(bridge, len(addresses) - MMIO_TAG_COUNT)
+    for request in rest:
+        await send_completion(bridge, request.mreq_header.tag, request.get_address() + 1)
+
+    assert [request.get_address() for request in first + rest] == addresses
+    assert await reads == [addr + 1 for addr in addresses]
+    assert not bridge._mmio_reads
+    await stop_processing(bridge, processor)
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_rejects_outstanding_tag(bridge: IoBridge, monkeypatch):
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    read = asyncio.create_task(bridge.read_mmio(0x2000, 4))
+    (request,) = await get_read_requests(bridge, 1)
+    tag = request.mreq_header.tag
+    outstanding = bridge._mmio_reads[tag]
+
+    monkeypatch.setattr(CxlIoBasePacket, "tag", (tag - 1) % 256)
+    with pytest.raises(Exception):
+        await bridge.read_mmio_batch([(0x3000, 4), (0x3004, 4)])
+    assert bridge._mmio_reads == {tag: outstanding}
+
+    await send_completion(bridge, tag, 0x1234)
+    assert await read == 0x1234
+    await stop_processing(bridge, processor)
+    assert not bridge._mmio_reads
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_unknown_tag(bridge: IoBridge):
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    read = asyncio.create_task(bridge.read_mmio(0x2000, 4))
+
+    (request,) = await get_read_requests(bridge, 1)
+    tag = request.mreq_header.tag
+    await send_completion(bridge, (tag + 1) % 256, 0xBAD)
+    await asyncio.sleep(0)
+    assert not read.done()
+    assert list(bridge._mmio_reads) == [tag]
+
+    await send_completion(bridge, tag, 0x1234)
+    assert await read == 0x1234
+    assert not bridge._mmio_reads
+
+    # NOTE: A duplicate completion for an already completed read is dropped as well
+    await send_completion(bridge, tag, 0xBAD)
+    await stop_processing(bridge, processor)
+    assert not bridge._mmio_reads
+
+
+@pytest.mark.asyncio
+async def test_io_bridge_mmio_read_timeout(bridge: IoBridge, monkeypatch):
+    monkeypatch.setattr(io_bridge, "timeout", lambda _: asyncio.timeout(0.01))
+
+    assert await bridge.read_mmio(0x3000, 4) is None
+    assert not bridge._mmio_reads
+
+    assert await bridge.read_mmio_batch([(0x3000, 4), (0x3004, 4)]) is None
+    assert not bridge._mmio_reads
+
+    # NOTE: Late completions for timed-out reads are dropped
+    processor = asyncio.create_task(bridge.process_target_to_host_mmio_packets())
+    for request in await get_read_requests(bridge, 3):
+        await send_completion(bridge, request.mreq_header.tag, 0)
+    await stop_processing(bridge, processor)
+    assert not bridge._mmio_reads
@@ -0,0 +1,222 @@
+"""
+ Copyright (c) 2024, Eeum, Inc.
+
+ This software is licensed under the terms of the Revised BSD License.
+ See LICENSE for details.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import os
+import pytest
+
+from opencis.cxl.component.cache_controller import MEM_ADDR_TYPE
+from opencis.cxl.component.cxl_memory_hub import CxlMemoryHub, CxlMemoryHubConfig
+from opencis.cxl.component.root_complex.root_complex import SystemMemControllerConfig
+from opencis.cxl.component.root_complex.root_port_client_manager import RootPortClientConfig
+from opencis.cxl.component.root_complex.root_port_switch import ROOT_PORT_SWITCH_TYPE
+from opencis.cxl.transport.memory_fifo import (
+    MemoryRequest,
+    MemoryResponse,
+    MEMORY_REQUEST_TYPE,
+    MEMORY_RESPONSE_STATUS,
+)
+
+# pylint: disable=protected-access, redefined-outer-name
+
+DRAM_BASE = 0x0
+DRAM_SIZE = 0x4000
+UNCACHED_BASE = DRAM_BASE + DRAM_SIZE
+UNCACHED_SIZE = 0x1000
+
+
+class FakeCacheController:
+    def __init__(self, hub: CxlMemoryHub):
+        self._fifo = hub._processor_to_cache_fifo
+        self.memory = bytearray(UNCACHED_BASE + UNCACHED_SIZE)
+        self.requests = []
+        self.packets = []
+
+    async def run(self):
+        while True:
+            packet = await self._fifo.request.get()
+            self.requests.append((packet.type, packet.addr, packet.size))
+            self.packets.append(packet)
+            start, end = packet.addr, packet.addr + packet.size
+            match packet.type:
+                case MEMORY_REQUEST_TYPE.READ | MEMORY_REQUEST_TYPE.UNCACHED_READ:
+                    data = int.from_bytes(self.memory[start:end], "little")
+                    response = MemoryResponse(MEMORY_RESPONSE_STATUS.OK, data)
+                case MEMORY_REQUEST_TYPE.WRITE | MEMORY_REQUEST_TYPE.UNCACHED_WRITE:
+                    self.memory[start:end] = packet.data.to_bytes(packet.size, "little")
+                    response = MemoryResponse(MEMORY_RESPONSE_STATUS.OK)
+            # NOTE: The request is still held here, so it must not be back in the pool
+            assert not is_pooled(packet)
+            await self._fifo.response.put(response)
+
+
+def is_pooled(packet: MemoryRequest) -> bool:
+    return any(packet is pooled for pooled in MemoryRequest._pool)
+
+
+@pytest.fixture
+def hub(tmp_path):
+    config = CxlMemoryHubConfig(
+        host_name="MyHost",
+        root_bus=0,
+        sys_mem_controller=SystemMemControllerConfig(DRAM_SIZE, str(tmp_path / "mem.bin")),
+        irq_handler=None,
+        root_port_switch_type=ROOT_PORT_SWITCH_TYPE.PASS_THROUGH,
+        root_ports=[RootPortClientConfig(0, "localhost", 8000)],
+    )
+    hub = CxlMemoryHub(config)
+    hub.add_mem_range(DRAM_BASE, DRAM_SIZE, MEM_ADDR_TYPE.DRAM)
+    hub.add_mem_range(UNCACHED_BASE, UNCACHED_SIZE, MEM_ADDR_TYPE.CXL_UNCACHED)
+    return hub
+
+
+@asynccontextmanager
+async def run_cache_controller(hub: CxlMemoryHub):
+    cache_controller = FakeCacheController(hub)
+    task = asyncio.create_task(cache_controller.run())
+    try:
+        yield cache_controller
+    finally:
+        task.cancel()
+
+
+async def load_cachelines(hub: CxlMemoryHub, addr: int, size: int) -> bytes:
+    cachelines = [await hub.load(addr + offset, 64) for offset in range(0, size, 64)]
+    data = b"".join(cacheline.to_bytes(64, "little") for cacheline in cachelines)
+    return data[:size]
+
+
+async def store_cachelines(hub: CxlMemoryHub, addr: int, data: bytes):
+    for offset in range(0, len(data), 64):
+        await hub.store(addr + offset, 64, int.from_bytes(data[offset : offset + 64], "little"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("addr", [DRAM_BASE + 0x100, UNCACHED_BASE + 0x100])
+@pytest.mark.parametrize("size", [1, 63, 64, 65, 200])
+async def test_memory_hub_store_bytes_matches_store(hub: CxlMemoryHub, addr, size):
+    async with run_cache_controller(hub) as cache_controller:
+        data = os.urandom(size)
+
+        assert await hub.store_bytes(addr, data)
+        bulk_memory = bytes(cache_controller.memory)
+
+        cache_controller.memory[:] = bytes(len(cache_controller.memory))
+        await store_cachelines(hub, addr, data)
+        assert bytes(cache_controller.memory) == bulk_memory
+
+        # NOTE: The partial last cacheline is zero-padded up to 64 bytes
+        padded_size = (size + 63) & ~63
+        assert bulk_memory[addr : addr + padded_size] == data + bytes(padded_size - size)
+
+
+@pytest.mark.asyncio
+async def test_memory_hub_store_bytes_unaligned(hub: CxlMemoryHub):
+    async with run_cache_controller(hub) as cache_controller:
+        with pytest.raises(Exception):
+            await hub.store_bytes(DRAM_BASE + 0x20, bytes(64))
+        assert not cache_controller.requests
+
+
+@pytest.mark.asyncio
+async def test_memory_hub_store_bytes_across_ranges(hub: CxlMemoryHub):
+    async with run_cache_controller(hub) as cache_controller:
+        # NOTE: The range spans DRAM and uncached memory, so each cacheline takes the
+        # per-request path with its own request type
+        addr = UNCACHED_BASE - 0x80
+        data = os.urandom(0x100 - 0x10)
+
+        assert await hub.store_bytes(addr, data)
+        assert [request[0] for request in cache_controller.requests] == [
+            MEMORY_REQUEST_TYPE.WRITE,
+            MEMORY_REQUEST_TYPE.WRITE,
+            MEMORY_REQUEST_TYPE.UNCACHED_WRITE,
+            MEMORY_REQUEST_TYPE.UNCACHED_WRITE,
+        ]
+        bulk_memory = bytes(cache_controller.memory)
+        cache_controller.memory[:] = bytes(len(cache_controller.memory))
+        await store_cachelines(hub, addr, data)
+        assert bytes(cache_controller.memory) == bulk_memory
+
+
+@pytest.mark.asyncio
+async def test_memory_hub_store_bytes_out_of_bounds(hub: CxlMemoryHub):
+    async with run_cache_controller(hub) as cache_controller:
+        addr = UNCACHED_BASE + UNCACHED_SIZE
+
+        assert not await hub.store_bytes(addr, bytes(64))
+        assert not await hub.store_bytes(addr - 0x40, bytes(0x80))
+        assert len(cache_controller.requests) == 1
+
+
+def test_memory_request_reset_on_reuse():
+    MemoryRequest._pool.clear()
+    packet = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.WRITE, 0x40, 64, 0xABCD)
+    packet.release()
+    assert is_pooled(packet)
+
+    reused = MemoryRequest.acquire(MEMORY_REQUEST_TYPE.READ, 0x80, 32)
+    assert reused is packet
+    assert reused == MemoryRequest(MEMORY_REQUEST_TYPE.READ, 0x80, 32)
+    assert not MemoryRequest._pool
+
+    assert MemoryRequest.acquire(MEMORY_REQUEST_TYPE.READ, 0x80, 32) is not packet
+
+
+@pytest.mark.asyncio
+async def test_memory_hub_releases_requests_after_response(hub: CxlMemoryHub):
+    MemoryRequest._pool.clear()
+    async with run_cache_controller(hub) as cache_controller:
+        data = os.urandom(256)
+        assert await hub.store_bytes(DRAM_BASE, data)
+        stores = list(cache_controller.packets)
+        assert len(stores) == 4
+        assert all(is_pooled(packet) for packet in stores)
+
+        cache_controller.packets.clear()
+        assert await hub.store_bytes(DRAM_BASE + 0x100, data[::-1])
+        reused = cache_controller.packets
+        assert {id(packet) for packet in reused} == {id(packet) for packet in stores}
+        assert [packet.addr for packet in reused] == [DRAM_BASE + 0x100 + i * 64 for i in range(4)]
+        assert bytes(cache_controller.memory[0x100:0x200]) == data[::-1]
+
+        await hub.store(DRAM_BASE, 64, 0x1234)
+        assert await hub.load(DRAM_BASE, 64) == 0x1234
+        assert len(MemoryRequest._pool) == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("addr", [DRAM_BASE + 0x100, DRAM_BASE + 0x123, UNCACHED_BASE + 0x7])
+@pytest.mark.parametrize("size", [1, 63, 64, 65, 200])
+async def test_memory_hub_load_bytes_matches_load(hub: CxlMemoryHub, addr, size):
+    async with run_cache_controller(hub) as cache_controller:
+        cache_controller.memory[:] = os.urandom(len(cache_controller.memory))
+
+        data = await hub.load_bytes(addr, size)
+        assert data == await load_cachelines(hub, addr, size)
+        assert data == bytes(cache_controller.memory[addr : addr + size])
+
+
+@pytest.mark.asyncio
+async def test_memory_hub_load_bytes_across_ranges(hub: CxlMemoryHub):
+    async with run_cache_controller(hub) as cache_controller:
+        cache_controller.memory[:] = os.urandom(len(cache_controller.memory))
+        addr = UNCACHED_BASE - 0x80 + 0x5
+        size = 0x100 - 0x10
+
+        data = await hub.load_bytes(addr, size)
+        assert [request[0] for request in cache_controller.requests] == [
+            MEMORY_REQUEST_TYPE.READ,
+            MEMORY_REQUEST_TYPE.READ,
+            MEMORY_REQUEST_TYPE.UNCACHED_READ,
+            MEMORY_REQUEST_TYPE.UNCACHED_READ,
+        ]
+        assert data == await load_cachelines(hub, addr, size)
+        assert data == bytes(cache_controller.memory[addr : addr + size])
+
+        assert not await hub.store_bytes(UNCACHED_BASE + UNCACHED_SIZE, bytes(64))
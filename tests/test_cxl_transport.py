@@ -0,0 +1,173 @@
+"""
+ Copyright (c) 2024, Eeum, Inc.
+
+ This software is licensed under the terms of the Revised BSD License.
+ See LICENSE for details.
+"""
+
+import pytest
+
+from opencis.cxl.transport.common import PAYLOAD_TYPE
+from opencis.cxl.transport.transaction import (
+    CXL_CACHE_D2HREQ_OPCODE,
+    CXL_CACHE_MSG_CLASS,
+    CxlCacheCacheD2HDataPacket,
+    CxlCacheCacheD2HReqPacket,
+    CxlCacheCacheH2DDataPacket,
+    CxlCacheD2HDataPacket,
+    CxlCacheH2DDataPacket,
+    CxlMemMemRdPacket,
+    CxlMemMemWrPacket,
+    GetLdInfoRequestPacket,
+    GetLdInfoResponsePacket,
+    SetLdAllocationsRequestPacket,
+    is_cxl_cache_d2h_data,
+    is_cxl_cache_h2d_data,
+)
+
+
+def is_h2d_data_by_fields(packet) -> bool:
+    return (
+        packet.is_cxl_cache()
+        and packet.cxl_cache_header.msg_class == CXL_CACHE_MSG_CLASS.H2D_DATA
+        and packet.h2ddata_header.valid == 1
+    )
+
+
+def is_d2h_data_by_fields(packet) -> bool:
+    return (
+        packet.is_cxl_cache()
+        and packet.cxl_cache_header.msg_class == CXL_CACHE_MSG_CLASS.D2H_DATA
+        and packet.d2hdata_header.valid == 1
+    )
+
+
+def test_cxl_cache_data_predicates():
+    h2d = CxlCacheCacheH2DDataPacket.create(cache_id=0xF, data=0xDEADBEEF, cqid=0xFFF)
+    d2h = CxlCacheCacheD2HDataPacket.create(uqid=0xFFF, data=0xDEADBEEF)
+    assert is_cxl_cache_h2d_data(h2d) and is_h2d_data_by_fields(h2d)
+    assert not is_cxl_cache_d2h_data(h2d)
+    assert is_cxl_cache_d2h_data(d2h) and is_d2h_data_by_fields(d2h)
+    assert not is_cxl_cache_h2d_data(d2h)
+
+    # NOTE: Only the valid bit of the data header may decide, not its neighbouring bits
+    h2d.h2ddata_header.valid = 0
+    d2h.d2hdata_header.valid = 0
+    assert not is_cxl_cache_h2d_data(h2d) and not is_h2d_data_by_fields(h2d)
+    assert not is_cxl_cache_d2h_data(d2h) and not is_d2h_data_by_fields(d2h)
+    assert h2d.h2ddata_header.cqid == 0xFFF
+    assert d2h.d2hdata_header.uqid == 0xFFF
+
+    h2d.h2ddata_header.valid = 1
+    h2d.system_header.payload_type = PAYLOAD_TYPE.CXL_MEM
+    assert not is_cxl_cache_h2d_data(h2d) and not is_h2d_data_by_fields(h2d)
+
+
+def test_cxl_cache_data_predicates_from_wire():
+    h2d = CxlCacheCacheH2DDataPacket.create(cache_id=1, data=0x1234, cqid=2)
+    d2h = CxlCacheCacheD2HDataPacket.create(uqid=3, data=0x5678)
+
+    wire_h2d = CxlCacheH2DDataPacket()
+    wire_h2d.reset(bytes(h2d))
+    wire_d2h = CxlCacheD2HDataPacket()
+    wire_d2h.reset(bytes(d2h))
+    assert is_cxl_cache_h2d_data(wire_h2d) and is_h2d_data_by_fields(wire_h2d)
+    assert is_cxl_cache_d2h_data(wire_d2h) and is_d2h_data_by_fields(wire_d2h)
+
+    d2h_req = CxlCacheCacheD2HReqPacket.create(0x40, 0, CXL_CACHE_D2HREQ_OPCODE.CACHE_RD_OWN)
+    for packet in (d2h_req, CxlMemMemRdPacket.create(0)):
+        assert not is_cxl_cache_h2d_data(packet)
+        assert not is_cxl_cache_d2h_data(packet)
+
+
+def test_cacheline_address_follows_header_writes():
+    packet = CxlMemMemRdPacket.create(0x80)
+    assert packet.get_address() == 0x80
+
+    packet.m2sreq_header.addr = 0x10
+    assert packet.get_address() == 0x400
+
+    with pytest.raises(Exception):
+        CxlMemMemRdPacket.create(0x1001)
+
+
+def test_cacheline_address_after_reset():
+    rd_packet = CxlMemMemRdPacket.create(0x80)
+    wr_packet = CxlMemMemWrPacket.create(0xC0, 0x1234)
+    assert rd_packet.get_address() == 0x80
+
+    rd_packet.reset(bytes(CxlMemMemRdPacket.create(0x2000)))
+    assert rd_packet.get_address() == 0x2000
+    assert wr_packet.get_address() == 0xC0
+
+
+def test_payload_length_written_with_headers():
+    packet = SetLdAllocationsRequestPacket.create(200, 0, bytes(200 * 16))
+    assert packet.system_header.payload_length == len(packet)
+    assert packet.get_payload_type() == PAYLOAD_TYPE.CCI_MCTP
+
+    # NOTE: payload_length is 12 bits wide, a longer packet must not be truncated silently
+    with pytest.raises(Exception):
+        SetLdAllocationsRequestPacket.create(255, 0, bytes(255 * 16))
+
+
+def test_payload_type_follows_system_header_writes():
+    packet = CxlMemMemRdPacket.create(0x80)
+    assert packet.get_payload_type() is PAYLOAD_TYPE.CXL_MEM
+    assert packet.is_cxl_mem()
+
+    packet.system_header.payload_type = PAYLOAD_TYPE.CXL_CACHE
+    assert packet.get_payload_type() is PAYLOAD_TYPE.CXL_CACHE
+    assert packet.is_cxl_cache()
+    assert not packet.is_cxl_mem()
+    assert packet.system_header.payload_length == len(packet)
+
+
+def test_pooled_cci_packet_acquire_and_release():
+    GetLdInfoRequestPacket._pool.clear()
+
+    packet = GetLdInfoRequestPacket.create()
+    assert bytes(packet) == bytes(GetLdInfoRequestPacket.create())
+    packet.header_data.message_tag = 0x5A
+    packet.release()
+    assert len(GetLdInfoRequestPacket._pool) == 1
+
+    # A pooled packet is reset to the requested contents before it is reused
+    reused = GetLdInfoRequestPacket.create()
+    assert reused is packet
+    assert reused.header_data.message_tag == 0
+    assert len(GetLdInfoRequestPacket._pool) == 0
+
+    reused.release()
+    zeroed = GetLdInfoRequestPacket.acquire()
+    assert zeroed is packet
+    assert bytes(zeroed) == bytes(len(zeroed))
+
+
+def test_pooled_cci_packet_double_release():
+    GetLdInfoResponsePacket._pool.clear()
+
+    packet = GetLdInfoResponsePacket.create(0x1000, 2, 7)
+    packet.release()
+    packet.release()
+    assert len(GetLdInfoResponsePacket._pool) == 1
+
+    first = GetLdInfoResponsePacket.create(0x2000, 1, 8)
+    second = GetLdInfoResponsePacket.create(0x3000, 1, 9)
+    assert first is packet
+    assert second is not first
+    assert first.header_data.message_tag == 8
+    assert second.header_data.message_tag == 9
+
+
+def test_get_ld_info_request_batch():
+    tags = [0, 1, 0x7F, 0xFF]
+    views = GetLdInfoRequestPacket.create_batch(tags)
+    assert len(views) == len(tags)
+    for view, tag in zip(views, tags):
+        packet = GetLdInfoRequestPacket.create()
+        packet.header_data.message_tag = tag
+        assert bytes(view) == bytes(packet)
+        assert view.obj is views[0].obj
+
+    assert not GetLdInfoRequestPacket.create_batch([])
@@ -12,7 +12,12 @@ from typing import List, cast
 import pytest
 
 from opencis.apps.multi_logical_device import MultiLogicalDevice
-from opencis.cxl.cci.common import CCI_FM_API_COMMAND_OPCODE
+from opencis.cxl.cci.common import (
+    CCI_FM_API_COMMAND_OPCODE,
+    TunnelManagementRequestPayload,
+    TunnelManagementResponsePayload,
+    TunnelManagementTargetType,
+)
 from opencis.cxl.component.common import CXL_COMPONENT_TYPE
 from opencis.cxl.component.cxl_packet_processor import CxlPacketProcessor
 from opencis.cxl.component.packet_reader import PacketReader
@@ -351,8 +356,7 @@ async def test_multi_logical_device_ld_id():
         get_ld_info_cci_message_header.message_category = 0
         get_ld_info_cci_message_header.message_tag = 0
         get_ld_info_cci_message_header.command_opcode = CCI_FM_API_COMMAND_OPCODE.GET_LD_INFO
-        get_ld_info_cci_message_header.message_payload_length_high = 0
-        get_ld_info_cci_message_header.message_payload_length_low = 11
+        get_ld_info_cci_message_header.message_payload_length = 11
         get_ld_info_cci_message_header.return_code = 0
         get_ld_info_cci_message_header.vendor_specific_extended_status = 0
         # data is bytes format and 0
@@ -360,12 +364,10 @@ async def test_multi_logical_device_ld_id():
 
         get_ld_info_cci_message = CciMessagePacket.create(get_ld_info_cci_message_header, data)
         tag_check = get_ld_info_cci_message.header.message_tag
-        logger.info(f"[PyTest]  @@ {get_ld_info_cci_message.header.message_payload_length_high}")
-        logger.info(f"[PyTest]  @@ {get_ld_info_cci_message.header.message_payload_length_low}")
+        logger.info(f"[PyTest]  @@ {get_ld_info_cci_message.header.message_payload_length}")
 
         get_ld_info_packet = GetLdInfoRequestPacket.create_from_ccimessage(get_ld_info_cci_message)
-        logger.info(f"[PyTest]  @@ {get_ld_info_packet.header_data.message_payload_length_high}")
-        logger.info(f"[PyTest]  @@ {get_ld_info_packet.header_data.message_payload_length_low}")
+        logger.info(f"[PyTest]  @@ {get_ld_info_packet.header_data.message_payload_length}")
         packet_writer.write(bytes(get_ld_info_packet))
         await packet_writer.drain()
         packet = await packet_reader.get_packet()
@@ -389,8 +391,7 @@ async def test_multi_logical_device_ld_id():
         get_ld_allocations_cci_message_header.command_opcode = (
             CCI_FM_API_COMMAND_OPCODE.GET_LD_ALLOCATIONS
         )
-        get_ld_allocations_cci_message_header.message_payload_length_high = 0
-        get_ld_allocations_cci_message_header.message_payload_length_low = 0
+        get_ld_allocations_cci_message_header.message_payload_length = 0
         get_ld_allocations_cci_message_header.return_code = 3
         get_ld_allocations_cci_message_header.vendor_specific_extended_status = 0
 
@@ -446,8 +447,7 @@ async def test_multi_logical_device_ld_id():
         # set_ld_allocations_cci_message_header.message_category = 0
         # set_ld_allocations_cci_message_header.message_tag = 0
         # set_ld_allocations_cci_message_header.command_opcode = CCI_FM_API_COMMAND_OPCODE.SET_LD_ALLOCATIONS
-        # set_ld_allocations_cci_message_header.message_payload_length_high = 0
-        # set_ld_allocations_cci_message_header.message_payload_length_low = 32
+        # set_ld_allocations_cci_message_header.message_payload_length = 32
         # set_ld_allocations_cci_message_header.return_code = 0
         # set_ld_allocations_cci_message_header.vendor_specific_extended_status = 0
 
@@ -569,7 +569,7 @@ async def test_multi_logical_device_ld_id():
         set_ld_allocations_request_packet = SetLdAllocationsRequestPacket.create(
             number_of_lds=4,
             start_ld_id=0,
-            ld_allocation_list=int.from_bytes(allocated_ld_bytes, "little"),
+            ld_allocation_list=allocated_ld_bytes,
         )
         packet_writer.write(bytes(set_ld_allocations_request_packet))
         await packet_writer.drain()
@@ -627,3 +627,65 @@ async def test_multi_logical_device_ld_id():
     # Stop pseudo server
     server.close()
     await server.wait_closed()
+
+
+def test_tunnel_request_payload_round_trip():
+    request = TunnelManagementRequestPayload(
+        port_or_ld_id=3,
+        target_type=TunnelManagementTargetType.LD_POOL_CCI,
+        command_size=6,
+        command_payload=b"\x01\x02\x03\x04\x05\x06",
+    )
+    data = request.dump()
+    assert data == b"\x03\x01\x06\x00\x01\x02\x03\x04\x05\x06"
+    assert TunnelManagementRequestPayload.parse(data) == request
+
+
+def test_tunnel_request_payload_short_payload():
+    request = TunnelManagementRequestPayload(
+        port_or_ld_id=1, command_size=8, command_payload=b"\xaa\xbb\xcc"
+    )
+    data = request.dump()
+    assert len(data) == 4 + 8
+    assert data[4:] == b"\xaa\xbb\xcc" + bytes(5)
+
+    parsed = TunnelManagementRequestPayload.parse(data)
+    assert parsed.port_or_ld_id == 1
+    assert parsed.target_type == TunnelManagementTargetType.PORT_OR_LD_BASED
+    assert parsed.command_size == 8
+    assert parsed.command_payload == b"\xaa\xbb\xcc" + bytes(5)
+
+
+def test_tunnel_request_payload_size_mismatch():
+    data = TunnelManagementRequestPayload(command_size=4, command_payload=bytes(4)).dump()
+    with pytest.raises(ValueError):
+        TunnelManagementRequestPayload.parse(data[:-1])
+    with pytest.raises(ValueError):
+        TunnelManagementRequestPayload.parse(data + b"\x00")
+    with pytest.raises(ValueError):
+        TunnelManagementRequestPayload(command_size=2, command_payload=bytes(3)).dump()
+
+
+def test_tunnel_response_payload_round_trip():
+    response = TunnelManagementResponsePayload(response_size=5, payload=b"\x10\x20\x30")
+    data = response.dump()
+    assert data == b"\x05\x00\x00\x00\x10\x20\x30\x00\x00"
+
+    parsed = TunnelManagementResponsePayload.parse(data)
+    assert parsed.response_size == 5
+    assert parsed.payload == b"\x10\x20\x30\x00\x00"
+    assert parsed.dump() == data
+
+    empty = TunnelManagementResponsePayload()
+    assert empty.dump() == bytes(4)
+    assert TunnelManagementResponsePayload.parse(empty.dump()) == empty
+
+
+def test_tunnel_response_payload_size_mismatch():
+    data = TunnelManagementResponsePayload(response_size=4, payload=bytes(4)).dump()
+    with pytest.raises(ValueError):
+        TunnelManagementResponsePayload.parse(data[:-1])
+    with pytest.raises(ValueError):
+        TunnelManagementResponsePayload.parse(data + b"\x00")
+    with pytest.raises(ValueError):
+        TunnelManagementResponsePayload(response_size=1, payload=bytes(2)).dump()
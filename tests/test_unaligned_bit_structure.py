@@ -5,10 +5,12 @@
  See LICENSE for details.
 """
 
+import random
 import pytest
 
 from opencis.util.unaligned_bit_structure import (
     ShareableByteArray,
+    get_bit_layout,
     UnalignedBitStructure,
     BitField,
     ByteField,
@@ -289,3 +291,96 @@ def test_individual_structure_field():
     struct.reset()
     struct.bytes.field4 = 0xDEF12345
     assert str(struct) == "00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 45 23 f1 de"
+
+
+# (bit offset, bit width) pairs within a 24-byte buffer
+BIT_ACCESS_CASES = [
+    (0, 1),
+    (6, 4),  # crosses a byte boundary
+    (3, 21),  # spans three bytes
+    (63, 2),  # crosses the first 64-bit word boundary
+    (60, 8),
+    (56, 16),
+    (33, 64),  # 64 bits spread over nine bytes
+    (100, 60),  # crosses the second 64-bit word boundary
+    (3, 70),  # wider than 64 bits
+    (0, 128),
+    (5, 150),
+    (24 * 8 - 1, 1),  # ends at the last byte
+    (24 * 8 - 12, 12),
+    (24 * 8 - 64, 64),
+    (24 * 8 - 70, 70),
+    (0, 24 * 8),
+]
+
+
+def read_bits_reference(data: bytes, offset: int, width: int) -> int:
+    return (int.from_bytes(data, "little") >> offset) & ((1 << width) - 1)
+
+
+def write_bits_reference(data: bytes, offset: int, width: int, value: int) -> bytes:
+    mask = ((1 << width) - 1) << offset
+    word = int.from_bytes(data, "little")
+    word = (word & ~mask) | ((value << offset) & mask)
+    return word.to_bytes(len(data), "little")
+
+
+@pytest.mark.parametrize("offset, width", BIT_ACCESS_CASES)
+def test_shareable_bytearray_bits(offset, width):
+    rng = random.Random(offset * 1000 + width)
+    data = bytes(rng.getrandbits(8) for _ in range(24))
+    shared = ShareableByteArray(len(data), bytearray(data))
+    assert shared.read_bits(offset, width) == read_bits_reference(data, offset, width)
+
+    # NOTE: Bits above the field width are dropped and neighbouring bits are preserved
+    value = rng.getrandbits(width + 8)
+    shared.write_bits(offset, width, value)
+    assert bytes(shared) == write_bits_reference(data, offset, width, value)
+    assert shared.read_bits(offset, width) == value & ((1 << width) - 1)
+
+    shared.write_bits(offset, width, 0)
+    assert bytes(shared) == write_bits_reference(data, offset, width, 0)
+
+
+@pytest.mark.parametrize("offset, width", BIT_ACCESS_CASES)
+def test_shared_view_bits(offset, width):
+    # NOTE: The view sits in the middle of a larger buffer, so word-sized accesses
+    # near its end must leave the bytes after it untouched
+    rng = random.Random(offset * 1000 + width)
+    backing = bytearray(rng.getrandbits(8) for _ in range(8 + 24 + 8))
+    original = bytes(backing)
+    shared = ShareableByteArray(24, backing, offset=8)
+    data = original[8:32]
+    assert shared.read_bits(offset, width) == read_bits_reference(data, offset, width)
+
+    value = rng.getrandbits(width)
+    shared.write_bits(offset, width, value)
+    expected = write_bits_reference(data, offset, width, value)
+    assert bytes(backing) == original[:8] + expected + original[32:]
+    assert shared.read_bits(offset, width) == value
+
+
+@pytest.mark.parametrize("offset, width", BIT_ACCESS_CASES)
+def test_bit_layout_matches_bits(offset, width):
+    rng = random.Random(offset * 1000 + width)
+    data = bytes(rng.getrandbits(8) for _ in range(24))
+    shared = ShareableByteArray(len(data), bytearray(data))
+    layout = get_bit_layout(offset, width)
+    assert shared.read_bit_layout(layout) == shared.read_bits(offset, width)
+
+    value = rng.getrandbits(width)
+    shared.write_bit_layout(layout, value)
+    assert bytes(shared) == write_bits_reference(data, offset, width, value)
+
+
+def test_wide_bit_field_neighbours():
+    struct = StructureFieldStructure()
+    struct.bits.field5 = 0x1FFFFF
+    struct.bits.field7 = 1
+    struct.bits.field6 = 0xA5A5A5A5A5
+    assert struct.bits.field5 == 0x1FFFFF
+    assert struct.bits.field6 == 0xA5A5A5A5A5
+    assert struct.bits.field7 == 1
+
+    struct.bits.field6 = 0
+    assert str(struct) == "00 fc ff 7f 00 00 00 00 80 00 00 00 00 00 00 00 00 00 00"